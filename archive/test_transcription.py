@@ -11,9 +11,13 @@ Uses Instructor + Ollama for reliable structured output extraction with Pydantic
 Instructor provides automatic validation and retries for robust JSON parsing.
 """
 
+import asyncio
+import hashlib
 import json
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
@@ -22,30 +26,66 @@ from typing import List, Optional
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_MODEL = "qwen3:4b"  # Good for Chinese, fast enough for per-phrase processing
 
+# Concurrent LLM requests. Ollama only serves them in parallel when started
+# with OLLAMA_NUM_PARALLEL set, so keep the two in step.
+MAX_CONCURRENCY = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
 # Output format options
 OUTPUT_FORMAT_FULL = "full"  # Full English translation
 OUTPUT_FORMAT_EMOJI = "emoji"  # Emoji + brief keywords (saves space)
 OUTPUT_FORMAT_LEARN = "learn"  # Optimized for learning: pinyin-first with highlights
 
+# One SRT entry: index line, timestamp line, then text lines up to a blank line
+SRT_RE = re.compile(
+    r"^[ \t]*(\d+)[ \t]*\r?\n[ \t]*(.*?-->.*?)[ \t]*\r?\n((?:[ \t]*\S.*(?:\n|$))*)",
+    re.MULTILINE,
+)
+
+# Subtitle markup: any tag, and the <font> wrapping the highlighted word
+_TAG_RE = re.compile(r"<[^>]+>")
+_FONT_RE = re.compile(r"<font[^>]*>([^<]+)</font>")
+_HAN_RE = re.compile(r"[\u4e00-\u9fff]")  # CJK Unified Ideographs
+
+# Lyric lines longer than this are almost always ASR garbage
+MAX_PHRASE_CHARS = 40
+
+# Phrases sent to the LLM per request (one prompt, one numbered list)
+BATCH_SIZE = 16
+
+# Interpretations persist here between runs, so re-enhancing is near-instant
+CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "baobao-lyrics"
+    / "phrases.json"
+)
+
 
 # First, check if we can import the required packages
-def check_dependencies():
-    """Check and install required packages."""
+def check_dependencies(llm_only: bool = False):
+    """
+    Check and install required packages.
+
+    Args:
+        llm_only: Only check the LLM packages; the Whisper ones take
+                  seconds to import (torch, ctranslate2) and aren't used
+                  when just enhancing an existing SRT
+    """
     missing = []
 
-    try:
-        import stable_whisper
+    if not llm_only:
+        try:
+            import stable_whisper
 
-        print(f"✓ stable-ts version: {stable_whisper.__version__}")
-    except ImportError:
-        missing.append("stable-ts")
+            print(f"✓ stable-ts version: {stable_whisper.__version__}")
+        except ImportError:
+            missing.append("stable-ts")
 
-    try:
-        import faster_whisper
+        try:
+            import faster_whisper
 
-        print(f"✓ faster-whisper available")
-    except ImportError:
-        missing.append("faster-whisper")
+            print(f"✓ faster-whisper available")
+        except ImportError:
+            missing.append("faster-whisper")
 
     try:
         import instructor
@@ -76,6 +116,7 @@ def check_dependencies():
 
 # Pydantic models for structured LLM output
 from pydantic import BaseModel, Field
+from pydantic_core import from_json, to_json  # Rust JSON, faster than json
 
 
 class WordDetail(BaseModel):
@@ -112,6 +153,64 @@ class LearningLyricLine(BaseModel):
     word_details: List[WordDetail] = Field(description="Per-character breakdown")
 
 
+class PhraseBatch(BaseModel):
+    """Interpretations of several phrases, in the order they were given."""
+
+    items: List[PhraseInterpretation]
+
+
+class LearningBatch(BaseModel):
+    """Learning lines for several phrases, in the order they were given."""
+
+    items: List[LearningLyricLine]
+
+
+def _new_client(model: str, async_client: bool = False):
+    """Build an instructor client for model."""
+    import instructor
+
+    # Use instructor's from_provider for Ollama - handles all the complexity
+    kwargs = {"async_client": True} if async_client else {}
+    return instructor.from_provider(
+        f"ollama/{model}",
+        mode=instructor.Mode.JSON,  # JSON mode works best with qwen
+        **kwargs,
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_client(model: str):
+    """
+    Sync instructor client for model, shared by every interpreter.
+
+    Interpreters for different formats reuse one client (and its HTTP
+    connection pool) instead of each building their own. Async clients
+    aren't shared: their pool belongs to the event loop that first uses
+    it, and each process_srt_with_llm call runs its own loop.
+    """
+    return _new_client(model)
+
+
+def _needs_llm(clean_text: str) -> bool:
+    """Whether a phrase is worth an LLM call: has Chinese, not overly long."""
+    return (
+        len(clean_text) <= MAX_PHRASE_CHARS
+        and _HAN_RE.search(clean_text) is not None
+    )
+
+
+@lru_cache(maxsize=4096)
+def _cache_key(model: str, output_format: str, chinese_text: str) -> str:
+    """
+    Persistent-cache key for a phrase.
+
+    Memoized on the (model, format, text) tuple: every subtitle entry looks
+    its phrase up again, and word-level SRTs repeat each line once per word.
+    """
+    key = f"{model}|{output_format}|{chinese_text}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
 class ChineseLyricInterpreter:
     """Uses Instructor + Ollama for reliable structured output extraction."""
 
@@ -120,31 +219,66 @@ class ChineseLyricInterpreter:
         model: str = OLLAMA_MODEL,
         base_url: str = OLLAMA_BASE_URL,
         output_format: str = OUTPUT_FORMAT_FULL,
+        max_concurrency: int = MAX_CONCURRENCY,
     ):
         self.model = model
         self.base_url = base_url
         self.output_format = output_format
+        # Requests in flight at once; match the server's OLLAMA_NUM_PARALLEL
+        self.max_concurrency = max_concurrency
         self._client = None
+        self._aclient = None
+        # Cache for interpreted phrases (per instance; see load_cache)
+        self._cache: dict = {}
+        self._failed: set = set()  # Fallback results, never saved to disk
+        self._system_prompt = self._build_system_prompt()
 
     @property
     def client(self):
         """Lazy-initialize the instructor client."""
         if self._client is None:
-            import instructor
-
-            # Use instructor's from_provider for Ollama - handles all the complexity
-            self._client = instructor.from_provider(
-                f"ollama/{self.model}",
-                mode=instructor.Mode.JSON,  # JSON mode works best with qwen
-            )
+            self._client = _get_client(self.model)
         return self._client
 
+    @property
+    def aclient(self):
+        """
+        Lazy-initialize the async instructor client (for concurrent calls).
+
+        Only valid within one event loop; _interpret_all drops it afterwards.
+        """
+        if self._aclient is None:
+            self._aclient = _new_client(self.model, async_client=True)
+        return self._aclient
+
     def _get_cache_key(self, chinese_text: str) -> str:
-        """Create cache key from text and format."""
-        return f"{self.output_format}:{chinese_text}"
+        """Create cache key from model, format and text."""
+        return _cache_key(self.model, self.output_format, chinese_text)
 
-    # Cache for interpreted phrases
-    _cache: dict = {}
+    def load_cache(self) -> None:
+        """Load interpretations saved by earlier runs (no-op if none)."""
+        try:
+            self._cache.update(from_json(CACHE_FILE.read_bytes()))
+        except (OSError, ValueError):
+            pass
+
+    def save_cache(self) -> None:
+        """Merge this run's interpretations into the on-disk cache."""
+        saved = {}
+        try:
+            saved = from_json(CACHE_FILE.read_bytes())
+        except (OSError, ValueError):
+            pass
+        saved.update(
+            (key, value)
+            for key, value in self._cache.items()
+            if key not in self._failed
+        )
+
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.tmp{os.getpid()}")
+        tmp.write_bytes(to_json(saved))
+        os.replace(tmp, CACHE_FILE)  # Never leaves a half-written cache
 
     def interpret_phrase(self, chinese_text: str) -> dict:
         """
@@ -152,20 +286,148 @@ class ChineseLyricInterpreter:
 
         Uses Pydantic models for guaranteed structured output with automatic retries.
         """
-        # Clean the text (remove highlighting tags if any)
-        clean_text = re.sub(r"<[^>]+>", "", chinese_text).strip()
-
-        if not clean_text:
+        clean_text, cache_key = self._prepare(chinese_text)
+        if cache_key is None:
             return {"pinyin": "", "english": "", "word_details": []}
+        if not _needs_llm(clean_text):
+            return self._without_llm(clean_text)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        messages, response_model = self._build_messages(clean_text)
+        try:
+            # Instructor handles validation and retries automatically
+            result = self.client.create(
+                messages=messages,
+                response_model=response_model,
+                max_retries=2,
+                timeout=30.0,
+            )
+            result_dict = self._to_dict(result)
+        except Exception as e:
+            print(f"  ⚠ Instructor error for '{clean_text}': {e}")
+            result_dict = self._fallback(clean_text)
+            self._failed.add(cache_key)
+
+        self._cache[cache_key] = result_dict
+        return result_dict
 
-        # Check cache
-        cache_key = self._get_cache_key(clean_text)
+    async def ainterpret_phrase(self, chinese_text: str) -> dict:
+        """Async interpret_phrase, so many phrases can be in flight at once."""
+        clean_text, cache_key = self._prepare(chinese_text)
+        if cache_key is None:
+            return {"pinyin": "", "english": "", "word_details": []}
+        if not _needs_llm(clean_text):
+            return self._without_llm(clean_text)
         if cache_key in self._cache:
             return self._cache[cache_key]
 
+        messages, response_model = self._build_messages(clean_text)
+        try:
+            result = await self.aclient.create(
+                messages=messages,
+                response_model=response_model,
+                max_retries=2,
+                timeout=30.0,
+            )
+            result_dict = self._to_dict(result)
+        except Exception as e:
+            print(f"  ⚠ Instructor error for '{clean_text}': {e}")
+            result_dict = self._fallback(clean_text)
+            self._failed.add(cache_key)
+
+        self._cache[cache_key] = result_dict
+        return result_dict
+
+    async def ainterpret_phrases_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Interpret several phrases with one LLM request.
+
+        Falls back to one request per phrase if the batch call fails or
+        returns the wrong number of items.
+        """
+        prepared = [self._prepare(text) for text in texts]
+        todo = [
+            (clean_text, cache_key)
+            for clean_text, cache_key in dict(prepared).items()
+            if cache_key is not None
+            and cache_key not in self._cache
+            and _needs_llm(clean_text)
+        ]
+
+        if len(todo) > 1:
+            numbered = "\n".join(
+                f"{i}. {clean_text}" for i, (clean_text, _) in enumerate(todo, 1)
+            )
+            messages, response_model = self._build_messages(
+                f"\n{numbered}\n\nReturn one item per numbered line, in the same order."
+            )
+            batch_model = (
+                LearningBatch if response_model is LearningLyricLine else PhraseBatch
+            )
+            try:
+                result = await self.aclient.create(
+                    messages=messages,
+                    response_model=batch_model,
+                    max_retries=2,
+                    timeout=30.0 * len(todo),
+                )
+                if len(result.items) == len(todo):
+                    for (_, cache_key), item in zip(todo, result.items):
+                        self._cache[cache_key] = self._to_dict(item)
+                else:
+                    print(
+                        f"  ⚠ Batch returned {len(result.items)} items "
+                        f"for {len(todo)} phrases, retrying one by one"
+                    )
+            except Exception as e:
+                print(f"  ⚠ Batch error ({len(todo)} phrases), retrying one by one: {e}")
+
+        # Anything the batch didn't fill (or a single phrase) goes one by one
+        return [await self.ainterpret_phrase(text) for text in texts]
+
+    def _prepare(self, chinese_text: str) -> tuple:
+        """Clean the text (remove highlighting tags); cache key is None if empty."""
+        clean_text = _TAG_RE.sub("", chinese_text).strip()
+        if not clean_text:
+            return clean_text, None
+        return clean_text, self._get_cache_key(clean_text)
+
+    def _without_llm(self, clean_text: str) -> dict:
+        """Result for text that _needs_llm rejects."""
+        if len(clean_text) > MAX_PHRASE_CHARS:
+            print(
+                f"  ⚠ Skipping {len(clean_text)}-char line "
+                f"(likely ASR garbage): '{clean_text[:20]}...'"
+            )
+            return self._fallback(clean_text)
+        # No Chinese (punctuation, numbers, stray English): shown as-is
+        return {"pinyin": clean_text, "english": clean_text, "word_details": []}
+
+    def _build_messages(self, clean_text: str) -> tuple:
+        """
+        Build the chat messages and response model for the output format.
+
+        The rules live in a system message that is byte-identical on every
+        call, so Ollama can reuse its KV cache for the prefix; only the
+        short user message changes.
+        """
+        response_model = (
+            LearningLyricLine
+            if self.output_format == OUTPUT_FORMAT_LEARN
+            else PhraseInterpretation
+        )
+        messages = [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": f"Chinese: {clean_text}"},
+        ]
+        return messages, response_model
+
+    def _build_system_prompt(self) -> str:
+        """Fixed instructions for the output format (built once per instance)."""
         # Use learning-optimized format
         if self.output_format == OUTPUT_FORMAT_LEARN:
-            return self._interpret_for_learning(clean_text, cache_key)
+            return self._learning_system_prompt()
 
         # Build the prompt based on output format
         if self.output_format == OUTPUT_FORMAT_EMOJI:
@@ -176,9 +438,7 @@ Keep it visual and minimal for children."""
             format_instruction = """For english fields: use simple 2-5 word translations.
 Use simple words appropriate for children learning Chinese."""
 
-        prompt = f"""Analyze this Chinese phrase for a children's learning song.
-
-Chinese: {clean_text}
+        return f"""Analyze the Chinese phrase given by the user for a children's learning song.
 
 {format_instruction}
 
@@ -189,54 +449,15 @@ Rules:
 
 /no_think"""
 
-        try:
-            # Instructor handles validation and retries automatically
-            result = self.client.create(
-                messages=[{"role": "user", "content": prompt}],
-                response_model=PhraseInterpretation,
-                max_retries=2,
-                timeout=30.0,
-            )
-
-            # Convert Pydantic model to dict for caching
-            result_dict = {
-                "pinyin": result.pinyin,
-                "english": result.english,
-                "word_details": [
-                    {"char": w.char, "pinyin": w.pinyin, "english": w.english}
-                    for w in result.word_details
-                ],
-            }
-
-            self._cache[cache_key] = result_dict
-            return result_dict
-
-        except Exception as e:
-            print(f"  ⚠ Instructor error for '{clean_text}': {e}")
-            # Fallback: return basic structure
-            fallback = {
-                "pinyin": clean_text,
-                "english": "?",
-                "word_details": [
-                    {"char": c, "pinyin": "?", "english": "?"}
-                    for c in clean_text
-                    if c.strip()
-                ],
-            }
-            self._cache[cache_key] = fallback
-            return fallback
-
-    def _interpret_for_learning(self, clean_text: str, cache_key: str) -> dict:
+    def _learning_system_prompt(self) -> str:
         """
-        Get learning-optimized interpretation with pedagogy focus.
+        Instructions for a learning-optimized interpretation with pedagogy focus.
 
         The LLM designs the best learning experience for each phrase.
         """
-        prompt = f"""You are a Chinese language teacher creating sing-along lyrics for children.
+        return """You are a Chinese language teacher creating sing-along lyrics for children.
 
-Analyze this Chinese phrase and create the BEST learning format:
-
-Chinese: {clean_text}
+Analyze the Chinese phrase given by the user and create the BEST learning format.
 
 Design your response to help a child:
 1. SING the pinyin correctly (spaced clearly, with tone marks)
@@ -260,48 +481,37 @@ Rules for sing_along_tip:
 
 /no_think"""
 
-        try:
-            result = self.client.create(
-                messages=[{"role": "user", "content": prompt}],
-                response_model=LearningLyricLine,
-                max_retries=2,
-                timeout=30.0,
+    def _to_dict(self, result) -> dict:
+        """Convert the Pydantic result to a dict for caching."""
+        # model_dump walks the nested models in pydantic-core, in one call
+        data = result.model_dump()
+        if isinstance(result, LearningLyricLine):
+            data["pinyin"] = data["pinyin_spaced"]
+            data["english"] = data.pop("natural_english")
+        return data
+
+    def _fallback(self, clean_text: str) -> dict:
+        """Basic structure used when the LLM call fails."""
+        fallback = {
+            "pinyin": clean_text,
+            "english": "?",
+            "word_details": [
+                {"char": c, "pinyin": "?", "english": "?"}
+                for c in clean_text
+                if c.strip()
+            ],
+        }
+        if self.output_format == OUTPUT_FORMAT_LEARN:
+            fallback.update(
+                pinyin_spaced=clean_text, literal_gloss="?", sing_along_tip=""
             )
-
-            result_dict = {
-                "pinyin": result.pinyin_spaced,
-                "pinyin_spaced": result.pinyin_spaced,
-                "literal_gloss": result.literal_gloss,
-                "english": result.natural_english,
-                "sing_along_tip": result.sing_along_tip,
-                "word_details": [
-                    {"char": w.char, "pinyin": w.pinyin, "english": w.english}
-                    for w in result.word_details
-                ],
-            }
-
-            self._cache[cache_key] = result_dict
-            return result_dict
-
-        except Exception as e:
-            print(f"  ⚠ Learning interpret error for '{clean_text}': {e}")
-            fallback = {
-                "pinyin": clean_text,
-                "pinyin_spaced": clean_text,
-                "literal_gloss": "?",
-                "english": "?",
-                "sing_along_tip": "",
-                "word_details": [
-                    {"char": c, "pinyin": "?", "english": "?"}
-                    for c in clean_text
-                    if c.strip()
-                ],
-            }
-            self._cache[cache_key] = fallback
-            return fallback
+        return fallback
 
     def format_subtitle_line(
-        self, chinese: str, highlight_idx: Optional[int] = None
+        self,
+        chinese: str,
+        highlight_idx: Optional[int] = None,
+        clean_text: Optional[str] = None,
     ) -> dict:
         """
         Format a subtitle line with pinyin and English.
@@ -309,16 +519,20 @@ Rules for sing_along_tip:
         Args:
             chinese: The Chinese text (may contain <font> highlighting)
             highlight_idx: Index of character being highlighted (if any)
+            clean_text: chinese with tags stripped, if the caller has it
         """
         # Extract clean text and find highlighted character
-        clean_text = re.sub(r"<[^>]+>", "", chinese).strip()
+        if clean_text is None:
+            clean_text = _TAG_RE.sub("", chinese).strip()
 
         # Find which character is highlighted in original
-        highlight_match = re.search(r"<font[^>]*>([^<]+)</font>", chinese)
+        highlight_match = _FONT_RE.search(chinese)
         highlighted_char = highlight_match.group(1) if highlight_match else None
 
-        # Get interpretation
-        interp = self.interpret_phrase(clean_text)
+        # Get interpretation (normally pre-interpreted, so a cache hit)
+        interp = self._cache.get(self._get_cache_key(clean_text)) if clean_text else None
+        if interp is None:
+            interp = self.interpret_phrase(clean_text)
 
         pinyin = interp.get("pinyin", "")
         english = interp.get("english", "")
@@ -326,14 +540,22 @@ Rules for sing_along_tip:
 
         # Build pinyin line with highlighting
         if highlighted_char and word_details:
-            pinyin_parts = []
-            for detail in word_details:
-                char = detail.get("char", "")
-                py = detail.get("pinyin", "")
-                if char == highlighted_char:
-                    pinyin_parts.append(f'<font color="#00ff00">{py}</font>')
-                else:
-                    pinyin_parts.append(py)
+            pinyin_parts = [d.get("pinyin", "") for d in word_details]
+            # word_details has one entry per character, so the highlight's
+            # offset in the line is also its offset in pinyin_parts; this
+            # picks the sung occurrence of repeated characters
+            start = len(_TAG_RE.sub("", chinese[: highlight_match.start()]).lstrip())
+            end = start + len(highlighted_char)
+            if len(pinyin_parts) == len(clean_text) and end <= len(pinyin_parts):
+                highlighted = range(start, end)
+            else:
+                highlighted = [
+                    i
+                    for i, d in enumerate(word_details)
+                    if d.get("char", "") == highlighted_char
+                ]
+            for i in highlighted:
+                pinyin_parts[i] = f'<font color="#00ff00">{pinyin_parts[i]}</font>'
             pinyin_highlighted = " ".join(pinyin_parts)
         else:
             pinyin_highlighted = pinyin
@@ -344,6 +566,7 @@ Rules for sing_along_tip:
             "pinyin_plain": pinyin,
             "english": english,
             "word_details": word_details,
+            "_interp": interp,  # Full interpretation, for format-specific fields
         }
 
 
@@ -363,6 +586,17 @@ def test_llm_connection():
                 print(f"✓ Model '{OLLAMA_MODEL}' available")
             else:
                 print(f"⚠ Model '{OLLAMA_MODEL}' not found. Available: {models[:5]}...")
+
+            # Server-side parallelism: without it, concurrent requests just queue
+            ps = requests.get(f"{OLLAMA_BASE_URL}/api/ps", timeout=5)
+            if ps.ok:
+                loaded = [m["name"] for m in ps.json().get("models", [])]
+                print(f"  Loaded models: {loaded or 'none'}")
+            print(f"  Sending up to {MAX_CONCURRENCY} requests at once. Start Ollama with")
+            print(
+                f"  OLLAMA_NUM_PARALLEL={MAX_CONCURRENCY} OLLAMA_MAX_LOADED_MODELS=2 "
+                "so they run in parallel"
+            )
             return True
     except Exception as e:
         print(f"⚠ Cannot connect to Ollama at {OLLAMA_BASE_URL}: {e}")
@@ -370,7 +604,18 @@ def test_llm_connection():
         return False
 
 
-def test_transcription(audio_path: str, model_size: str = "base"):
+# Decoder settings per quality level. Lyrics lines are short and independent,
+# so greedy decoding loses little, and conditioning on the previous line
+# mostly feeds hallucination loops (repeated choruses).
+TRANSCRIBE_QUALITY = {
+    "fast": {"beam_size": 1, "best_of": 1, "condition_on_previous_text": False},
+    "accurate": {"beam_size": 5, "best_of": 5, "condition_on_previous_text": True},
+}
+
+
+def test_transcription(
+    audio_path: str, model_size: str = "base", quality: str = "fast"
+):
     """
     Test transcription on a single audio file.
 
@@ -378,12 +623,16 @@ def test_transcription(audio_path: str, model_size: str = "base"):
         audio_path: Path to audio file
         model_size: Whisper model size (tiny, base, small, medium, large-v3)
                     Using large-v3 by default for best Chinese accuracy.
+        quality: "fast" (greedy, ~half the decoder work) or "accurate"
+                 (beam search with previous-text conditioning)
     """
     import stable_whisper
 
+    decode_options = TRANSCRIBE_QUALITY[quality]
+
     print(f"\n{'='*60}")
     print(f"Testing transcription: {Path(audio_path).name}")
-    print(f"Model: {model_size} (optimized for accuracy)")
+    print(f"Model: {model_size} (quality: {quality})")
     print(f"{'='*60}\n")
 
     # Load model (uses faster-whisper by default if available)
@@ -392,16 +641,13 @@ def test_transcription(audio_path: str, model_size: str = "base"):
     print("✓ Model loaded\n")
 
     # Transcribe with Chinese language hint
-    # Using settings optimized for accuracy over speed
-    print("Transcribing (this may take a few minutes for accuracy)...")
+    print("Transcribing (this may take a few minutes)...")
     result = model.transcribe(
         audio_path,
         language="zh",  # Chinese
         vad=True,  # Voice Activity Detection (good for music)
         regroup=True,  # Regroup words into natural segments
-        beam_size=5,  # Higher beam size for better accuracy
-        best_of=5,  # Consider more candidates
-        condition_on_previous_text=True,  # Better context
+        **decode_options,
     )
 
     # Refine timestamps for maximum accuracy (slower but more precise)
@@ -412,18 +658,14 @@ def test_transcription(audio_path: str, model_size: str = "base"):
 
     # Show results with timestamps
     print("--- Results with timestamps ---\n")
-    for segment in result.segments:
+    for i, segment in enumerate(result.segments):
         start = segment.start
         end = segment.end
         text = segment.text.strip()
         print(f"[{start:06.2f}s - {end:06.2f}s] {text}")
 
         # Show word-level timestamps for first segment only (as sample)
-        if (
-            segment == result.segments[0]
-            and hasattr(segment, "words")
-            and segment.words
-        ):
+        if i == 0 and getattr(segment, "words", None):
             print("\n  Word-level timestamps (first segment):")
             for word in segment.words[:5]:  # First 5 words
                 print(f"    [{word.start:.2f}s - {word.end:.2f}s] '{word.word}'")
@@ -448,6 +690,35 @@ def test_transcription(audio_path: str, model_size: str = "base"):
     return result
 
 
+async def _interpret_all(interpreter: ChineseLyricInterpreter, phrases) -> None:
+    """
+    Interpret phrases in batches of BATCH_SIZE per request, with at most
+    interpreter.max_concurrency requests in flight.
+    """
+    phrases = list(phrases)
+    semaphore = asyncio.Semaphore(interpreter.max_concurrency)
+    done = 0
+
+    async def bounded(batch):
+        nonlocal done
+        async with semaphore:
+            await interpreter.ainterpret_phrases_batch(batch)
+        done += len(batch)
+        print(f"  Progress: {done}/{len(phrases)}")
+
+    try:
+        await asyncio.gather(
+            *(
+                bounded(phrases[i : i + BATCH_SIZE])
+                for i in range(0, len(phrases), BATCH_SIZE)
+            )
+        )
+    finally:
+        # The client's connection pool is bound to this loop, which
+        # asyncio.run closes; the next run builds a fresh client
+        interpreter._aclient = None
+
+
 def process_srt_with_llm(
     srt_path: str,
     output_path: Optional[str] = None,
@@ -469,60 +740,58 @@ def process_srt_with_llm(
 
     # Initialize interpreter
     interpreter = ChineseLyricInterpreter(output_format=output_format)
+    interpreter.load_cache()
 
     # Read SRT file
-    with open(srt_path, "r", encoding="utf-8") as f:
+    with open(srt_path, "r", encoding="utf-8-sig") as f:
         content = f.read()
 
-    # Parse SRT entries
-    entries = []
-    current_entry = {}
-
-    for line in content.split("\n"):
-        line = line.strip()
-        if not line:
-            if current_entry:
-                entries.append(current_entry)
-                current_entry = {}
-        elif line.isdigit() and not current_entry:
-            current_entry["index"] = int(line)
-        elif "-->" in line:
-            current_entry["timestamp"] = line
-        elif current_entry:
-            current_entry["text"] = current_entry.get("text", "") + line
-
-    if current_entry:
-        entries.append(current_entry)
+    # Parse SRT entries in one regex scan (multi-line text is joined)
+    entries = [
+        {
+            "index": int(m[1]),
+            "timestamp": m[2],
+            "text": "".join(line.strip() for line in m[3].splitlines()),
+        }
+        for m in SRT_RE.finditer(content)
+    ]
 
     print(f"Found {len(entries)} subtitle entries")
 
-    # Process unique phrases first (for caching efficiency)
-    unique_phrases = set()
-    for entry in entries:
-        clean = re.sub(r"<[^>]+>", "", entry.get("text", "")).strip()
-        if clean:
-            unique_phrases.add(clean)
+    # Process unique phrases first (for caching efficiency); each entry's
+    # text is stripped of tags once and reused when rendering below
+    entry_clean = [_TAG_RE.sub("", entry.get("text", "")).strip() for entry in entries]
+    unique_phrases = list(dict.fromkeys(clean for clean in entry_clean if clean))
 
     print(f"Unique phrases to interpret: {len(unique_phrases)}")
     print("\nInterpreting phrases with LLM...")
 
-    # Pre-interpret all unique phrases
-    for i, phrase in enumerate(unique_phrases):
-        if (i + 1) % 10 == 0:
-            print(f"  Progress: {i+1}/{len(unique_phrases)}")
-        interpreter.interpret_phrase(phrase)
+    # Pre-interpret all unique phrases concurrently; results land in the
+    # interpreter's cache, so the formatting below never waits on the LLM
+    try:
+        interpreter.aclient
+    except TypeError:  # instructor too old for async_client
+        # Threads work nearly as well: blocking HTTP calls release the GIL
+        interpreter.client  # Create it once, before the threads race to
+        with ThreadPoolExecutor(max_workers=interpreter.max_concurrency) as pool:
+            list(pool.map(interpreter.interpret_phrase, unique_phrases))
+    else:
+        asyncio.run(_interpret_all(interpreter, unique_phrases))
+    interpreter.save_cache()
 
     print("✓ All phrases interpreted\n")
 
     # Build enhanced SRT based on format
     enhanced_entries = []
 
-    if output_format == OUTPUT_FORMAT_LEARN:
-        # Learning format: PINYIN is primary (what they sing from), with highlighting
-        for entry in entries:
-            text = entry.get("text", "")
-            result = interpreter.format_subtitle_line(text)
-            interp = interpreter.interpret_phrase(re.sub(r"<[^>]+>", "", text).strip())
+    for entry, clean in zip(entries, entry_clean):
+        result = interpreter.format_subtitle_line(
+            entry.get("text", ""), clean_text=clean
+        )
+
+        if output_format == OUTPUT_FORMAT_LEARN:
+            # Learning format: PINYIN is primary (what they sing from), with highlighting
+            interp = result["_interp"]
 
             # PINYIN FIRST (large, highlighted) - this is what learners sing!
             # Then Chinese characters below for reference
@@ -533,20 +802,8 @@ def process_srt_with_llm(
                 interp.get("sing_along_tip", "")
                 or f"({interp.get('literal_gloss', interp.get('english', ''))})",
             ]
-
-            enhanced_entries.append(
-                {
-                    "index": entry.get("index", 0),
-                    "timestamp": entry.get("timestamp", ""),
-                    "text": "\n".join(lines),
-                }
-            )
-    else:
-        # Original format: Chinese first
-        for entry in entries:
-            text = entry.get("text", "")
-            result = interpreter.format_subtitle_line(text)
-
+        else:
+            # Original format: Chinese first
             # Create multi-line subtitle: Chinese (highlighted), Pinyin, English
             lines = [
                 result["chinese"],  # Original with highlighting
@@ -554,13 +811,13 @@ def process_srt_with_llm(
                 f"({result['english']})",  # English in parentheses
             ]
 
-            enhanced_entries.append(
-                {
-                    "index": entry.get("index", 0),
-                    "timestamp": entry.get("timestamp", ""),
-                    "text": "\n".join(lines),
-                }
-            )
+        enhanced_entries.append(
+            {
+                "index": entry.get("index", 0),
+                "timestamp": entry.get("timestamp", ""),
+                "text": "\n".join(lines),
+            }
+        )
 
     # Write enhanced SRT
     if output_path is None:
@@ -572,11 +829,12 @@ def process_srt_with_llm(
         suffix = format_suffixes.get(output_format, ".enhanced.srt")
         output_path = str(Path(srt_path).with_suffix("").with_suffix(suffix))
 
+    buf = [
+        f"{entry['index']}\n{entry['timestamp']}\n{entry['text']}\n\n"
+        for entry in enhanced_entries
+    ]
     with open(output_path, "w", encoding="utf-8") as f:
-        for entry in enhanced_entries:
-            f.write(f"{entry['index']}\n")
-            f.write(f"{entry['timestamp']}\n")
-            f.write(f"{entry['text']}\n\n")
+        f.write("".join(buf))
 
     print(f"✓ Saved enhanced SRT to: {output_path}")
 
@@ -605,19 +863,21 @@ def main():
     print(f"  Whisper Model: {whisper_model}")
     print("=" * 60 + "\n")
 
-    # Check dependencies first
-    check_dependencies()
-
-    # Test LLM connection
-    llm_available = test_llm_connection()
-
     # Check for --llm-only mode (just process existing SRT)
-    if (
+    llm_only = (
         "--llm-only" in sys.argv
         or "--enhance" in sys.argv
         or "--emoji" in sys.argv
         or "--learn" in sys.argv
-    ):
+    )
+
+    # Check dependencies first
+    check_dependencies(llm_only=llm_only)
+
+    # Test LLM connection
+    llm_available = test_llm_connection()
+
+    if llm_only:
         if not llm_available:
             print("❌ LLM not available. Cannot enhance SRT.")
             sys.exit(1)
@@ -681,7 +941,8 @@ def main():
     # Run test with 'large-v3' model for best Chinese accuracy
     try:
         # result = test_transcription(test_file, model_size="base")
-        result = test_transcription(test_file, model_size="large-v3")
+        quality = "accurate" if "--accurate" in sys.argv else "fast"
+        result = test_transcription(test_file, model_size="large-v3", quality=quality)
 
         # If LLM available, also create enhanced version
         if llm_available:
@@ -0,0 +1,25 @@
+"""
+Console entry point for ``baobao`` and ``python -m baobao``.
+
+Answers ``--version`` before importing typer/rich so version checks in
+scripts don't pay for the full CLI framework.
+"""
+
+import sys
+
+
+def main() -> None:
+    """Run the baobao CLI."""
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        from . import __version__
+
+        sys.stdout.write(f"baobao version {__version__}\n")
+        return
+
+    from .cli import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+On-disk caches for transcription and enhancement output.
+
+Transcripts are keyed by a hash of the audio bytes plus every setting that
+changes the output, so re-running a transcription on unchanged audio is a
+file copy instead of a Whisper pass. Phrase interpretations are kept in one
+JSON file per LLM model, so re-enhancing a known song makes no LLM calls.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+from pathlib import Path
+
+from pydantic_core import from_json
+
+from . import __version__
+
+CACHE_ROOT = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "baobao"
+)
+CACHE_DIR = CACHE_ROOT / "transcripts"
+PHRASE_DIR = CACHE_ROOT / "phrases"
+
+
+def audio_digest(audio_path: str | Path) -> str:
+    """Hash an audio file's contents without reading it into memory."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(audio_path, "rb") as f:
+        # mmap cannot map empty files
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+    return digest.hexdigest()
+
+
+def transcript_key(
+    audio_path: str | Path,
+    model_size: str,
+    format: str,
+    word_highlight: bool,
+    batch_size: int | None = None,
+    refine: bool = True,
+) -> str:
+    """Build the cache key for a transcription of audio_path."""
+    settings = (
+        f"{__version__}:{model_size}:{format}:{word_highlight}:{batch_size}:{refine}"
+    )
+    settings_digest = hashlib.blake2b(settings.encode(), digest_size=8).hexdigest()
+    return f"{audio_digest(audio_path)}-{settings_digest}"
+
+
+def restore(key: str, output_path: Path) -> bool:
+    """Copy a cached transcript to output_path. Returns False on a miss."""
+    cached = CACHE_DIR / key
+    if not cached.is_file():
+        return False
+    shutil.copyfile(cached, output_path)
+    return True
+
+
+def store(key: str, output_path: Path) -> None:
+    """Save a finished transcript under key."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_DIR / f"{key}.tmp{os.getpid()}"
+    shutil.copyfile(output_path, tmp)
+    os.replace(tmp, CACHE_DIR / key)  # Atomic, safe with parallel workers
+
+
+def _phrase_file(model: str) -> Path:
+    """Cache file for one LLM model (model names contain ':' and '/')."""
+    return PHRASE_DIR / (re.sub(r"[^\w.-]", "_", model) + ".json")
+
+
+def load_phrases(model: str) -> dict[str, dict]:
+    """
+    Load cached phrase interpretations for model (empty on a miss).
+
+    Parsed with pydantic-core's jiter-based from_json, which is faster than
+    the json module on large caches.
+    """
+    try:
+        return from_json(_phrase_file(model).read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def store_phrases(model: str, phrases: dict[str, dict]) -> None:
+    """
+    Save phrase interpretations for model.
+
+    Merged into what's on disk rather than replacing it, so concurrent runs
+    (parallel enhance commands, batch) keep each other's new entries.
+    """
+    PHRASE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _phrase_file(model)
+    merged = load_phrases(model)
+    merged.update(phrases)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False)
+    os.replace(tmp, path)
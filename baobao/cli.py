@@ -8,8 +8,14 @@ Usage:
     baobao batch ./songs/                # Batch transcription
 """
 
+import fnmatch
+import functools
+import multiprocessing
+import os
 import shutil
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from enum import Enum
 from pathlib import Path
 from typing import Annotated, Optional
@@ -19,8 +25,9 @@ from rich.console import Console
 from rich.panel import Panel
 
 from . import __version__
-from .enhance import OutputFormat, enhance_srt
-from .transcribe import transcribe_audio
+
+# transcribe/enhance are imported inside the commands that use them so that
+# --version, play and preview start without loading the ML stack.
 
 app = typer.Typer(
     name="baobao",
@@ -28,7 +35,15 @@ app = typer.Typer(
     add_completion=False,
     rich_markup_mode="rich",
 )
-console = Console()
+# Rich's auto-highlighter re-scans every printed line for numbers, paths,
+# etc. Only worth it on a terminal; logs and pipes get plain text anyway.
+console = Console(highlight=sys.stdout.isatty())
+
+# Non-Unicode locales (old Windows consoles, LANG=C) get ASCII markers
+# instead of making Rich substitute emoji character by character.
+_ASCII = (sys.stdout.encoding or "").lower().replace("-", "") != "utf8"
+_ICON = "\\[baobao]" if _ASCII else "🐼"
+_OK = "OK" if _ASCII else "✓"
 
 
 class ModelSize(str, Enum):
@@ -41,10 +56,232 @@ class ModelSize(str, Enum):
     LARGE = "large-v3"
 
 
+class SubtitleFormat(str, Enum):
+    """Transcription output formats."""
+
+    SRT = "srt"
+    LRC = "lrc"
+
+
+class EnhanceFormat(str, Enum):
+    """Enhancement output formats (mirrors enhance.OutputFormat)."""
+
+    FULL = "full"
+    EMOJI = "emoji"
+    LEARN = "learn"
+
+
+def _prefetch_stats(entries: list[os.DirEntry]) -> None:
+    """
+    Stat directory entries concurrently.
+
+    os.DirEntry caches its stat result, so later .stat() calls are free.
+    On network filesystems the round-trips overlap instead of queueing.
+    """
+
+    def _stat(entry: os.DirEntry) -> None:
+        try:
+            entry.stat()
+        except OSError:
+            pass  # Vanished files are reported when they are used
+
+    if len(entries) > 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(entries))) as executor:
+            list(executor.map(_stat, entries))
+
+
+def _cuda_devices() -> list[str]:
+    """List visible CUDA device ids without initializing CUDA in this process."""
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is not None:
+        return [d.strip() for d in visible.split(",") if d.strip()]
+
+    if not shutil.which("nvidia-smi"):
+        return []
+    try:
+        out = subprocess.run(
+            ["nvidia-smi", "-L"], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    return [str(i) for i, line in enumerate(out.splitlines()) if line.strip()]
+
+
+# Per-process transcriber for batch workers (loaded once in the initializer)
+_worker_transcriber = None
+
+
+def _init_batch_worker(
+    model_size: str,
+    batch_size: Optional[int],
+    devices: list[str],
+    n_workers: int,
+    counter,
+) -> None:
+    """Pin a batch worker to its own GPU/CPUs and create its transcriber."""
+    global _worker_transcriber
+
+    with counter.get_lock():
+        worker_idx = counter.value
+        counter.value += 1
+
+    # Must happen before torch is imported in this process
+    if devices:
+        os.environ["CUDA_VISIBLE_DEVICES"] = devices[worker_idx % len(devices)]
+
+    # Disjoint CPU sets keep each worker's inference threads on warm caches
+    # instead of migrating between cores shared with the other workers.
+    if hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        my_cpus = cpus[worker_idx % n_workers :: n_workers]
+        if my_cpus:
+            os.sched_setaffinity(0, my_cpus)
+            os.environ["OMP_NUM_THREADS"] = str(len(my_cpus))
+
+    from .transcribe import Transcriber, TranscriptionConfig
+
+    # The model loads on the worker's first real transcription and is reused
+    # for the rest of its files (never loaded if they all hit the cache)
+    _worker_transcriber = Transcriber(
+        TranscriptionConfig(model_size=model_size, batch_size=batch_size)
+    )
+
+
+def _transcribe_in_worker(audio_file: Path, use_cache: bool) -> Path:
+    """Transcribe one file to SRT using the worker's transcriber."""
+    from .transcribe import transcribe_audio
+
+    return transcribe_audio(
+        audio_path=audio_file,
+        format="srt",
+        transcriber=_worker_transcriber,
+        use_cache=use_cache,
+    )
+
+
+# Subtitle suffixes in order of preference, including the .test.srt pattern
+_SRT_SUFFIXES = (
+    ".enhanced.srt",
+    ".learn.srt",
+    ".emoji.srt",
+    ".srt",
+    ".test.enhanced.srt",
+    ".test.srt",
+)
+_SUBTITLE_SUFFIXES = _SRT_SUFFIXES[:4] + (".lrc", ".ttml") + _SRT_SUFFIXES[4:]
+
+
+@functools.lru_cache(maxsize=1)
+def _mpv_path() -> Optional[str]:
+    """Resolve mpv on PATH once per process."""
+    return shutil.which("mpv")
+
+
+def _exec_mpv(mpv: str, audio_file: Path, subtitle: Path) -> None:
+    """
+    Hand the terminal over to mpv.
+
+    On POSIX the Python process is replaced by mpv, so the interpreter and
+    its imports don't stay resident during playback and the shell sees
+    mpv's exit code directly. Windows has no real exec, so wait on a child.
+    """
+    args = [mpv, f"--sub-file={subtitle}", str(audio_file)]
+
+    if os.name != "nt":
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(mpv, args)
+
+    try:
+        subprocess.run(args, check=True)
+    except subprocess.CalledProcessError as e:
+        console.print(
+            f"[bold red]Error:[/bold red] mpv exited with code {e.returncode}"
+        )
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass  # User quit with Ctrl+C
+
+
+def _find_subtitle(audio_file: Path, lyrics_formats: bool = True) -> Optional[Path]:
+    """
+    Find a subtitle file next to an audio file, in order of preference.
+
+    Lists the directory once and matches candidate names against it
+    instead of stat-ing every candidate.
+    """
+    suffixes = _SUBTITLE_SUFFIXES if lyrics_formats else _SRT_SUFFIXES
+
+    with os.scandir(audio_file.parent) as entries:
+        existing = {entry.name for entry in entries}
+
+    # Candidate names are plain strings on the stem; no Path round-trips
+    stem = audio_file.stem
+    for suffix in suffixes:
+        if stem + suffix in existing:
+            return audio_file.parent / (stem + suffix)
+    return None
+
+
+_BANNER_TMPL = f"[bold blue]{_ICON} {{title}}[/bold blue]\n{{body}}"
+
+
+def _banner(title: str, body: str) -> None:
+    """Print a command's header panel (a plain line when output is piped)."""
+    if console.is_terminal:
+        console.print(
+            Panel.fit(_BANNER_TMPL.format(title=title, body=body), border_style="blue")
+        )
+    else:
+        details = body.replace("\n", ", ")
+        print(f"{title}: {details}", flush=True)
+
+
+def _resolve_and_play(
+    audio_file: Path,
+    subtitle: Optional[Path],
+    title: str,
+    lyrics_formats: bool = True,
+) -> None:
+    """Shared body of play/preview: find mpv and a subtitle, then launch."""
+    # Check if mpv is available
+    mpv = _mpv_path()
+    if not mpv:
+        console.print("[bold red]Error:[/bold red] mpv not found")
+        console.print("[dim]Install with: sudo apt install mpv[/dim]")
+        raise typer.Exit(1)
+
+    # Find subtitle file if not specified
+    if subtitle is None:
+        subtitle = _find_subtitle(audio_file, lyrics_formats=lyrics_formats)
+
+        if subtitle is None:
+            looked_for = ".lrc, .ttml" if lyrics_formats else ".enhanced.srt"
+            console.print("[bold red]Error:[/bold red] No subtitle file found")
+            console.print(
+                f"[dim]Looked for: {audio_file.stem}.srt, {looked_for}, etc.[/dim]"
+            )
+            console.print(
+                "[dim]Run 'baobao transcribe' first or specify with -s[/dim]"
+            )
+            raise typer.Exit(1)
+
+    _banner(title, f"Audio: {audio_file.name}\nSubtitle: {subtitle.name}")
+
+    console.print("\n[dim]Starting mpv... Press 'q' to quit[/dim]\n")
+
+    # Run mpv with subtitles
+    _exec_mpv(mpv, audio_file, subtitle)
+
+
 def version_callback(value: bool):
     """Show version and exit."""
     if value:
-        console.print(f"[bold]baobao[/bold] version {__version__}")
+        if sys.stdout.isatty():
+            console.print(f"[bold]baobao[/bold] version {__version__}")
+        else:
+            # Scripts and pipes get plain text without going through Rich
+            sys.stdout.write(f"baobao version {__version__}\n")
         raise typer.Exit()
 
 
@@ -102,13 +339,13 @@ def transcribe(
         ),
     ] = ModelSize.LARGE,
     format: Annotated[
-        str,
+        SubtitleFormat,
         typer.Option(
             "--format",
             "-f",
             help="Output format: srt or lrc",
         ),
-    ] = "srt",
+    ] = SubtitleFormat.SRT,
     karaoke: Annotated[
         bool,
         typer.Option(
@@ -117,6 +354,20 @@ def transcribe(
             help="Enable word-by-word highlighting (karaoke style)",
         ),
     ] = False,
+    no_refine: Annotated[
+        bool,
+        typer.Option(
+            "--no-refine",
+            help="Skip timestamp refinement and use a quantized faster-whisper model",
+        ),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Always re-run Whisper, even for previously transcribed audio",
+        ),
+    ] = False,
 ):
     """
     Transcribe Chinese audio to time-synced subtitles.
@@ -128,25 +379,24 @@ def transcribe(
         baobao transcribe song.mp3
         baobao transcribe song.mp3 -m base  # Faster, less accurate
         baobao transcribe song.mp3 --karaoke  # Word highlighting
+        baobao transcribe song.mp3 --no-refine  # Faster, looser timing
     """
-    console.print(
-        Panel.fit(
-            f"[bold blue]🐼 Baobao Transcription[/bold blue]\n"
-            f"Model: {model.value}",
-            border_style="blue",
-        )
-    )
+    from .transcribe import transcribe_audio
+
+    _banner("Baobao Transcription", f"Model: {model.value}")
 
     try:
         output_path = transcribe_audio(
             audio_path=audio_file,
             output_path=output,
             model_size=model.value,
-            format=format,
+            format=format.value,
             word_highlight=karaoke,
+            refine=not no_refine,
+            use_cache=not no_cache,
         )
 
-        console.print("\n[bold green]✓ Done![/bold green]")
+        console.print(f"\n[bold green]{_OK} Done![/bold green]")
         console.print(f"Output: {output_path}")
 
     except FileNotFoundError as e:
@@ -176,13 +426,13 @@ def enhance(
         ),
     ] = None,
     format: Annotated[
-        OutputFormat,
+        EnhanceFormat,
         typer.Option(
             "--format",
             "-f",
             help="Output format: full, emoji, or learn",
         ),
-    ] = OutputFormat.FULL,
+    ] = EnhanceFormat.FULL,
     ollama_url: Annotated[
         str,
         typer.Option(
@@ -197,6 +447,13 @@ def enhance(
             help="LLM model for translations (e.g., qwen3:4b)",
         ),
     ] = "qwen3:4b",
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Ask the LLM again, even for phrases interpreted in earlier runs",
+        ),
+    ] = False,
 ):
     """
     Enhance subtitles with pinyin and English translations.
@@ -213,24 +470,21 @@ def enhance(
         baobao enhance lyrics.srt --format emoji
         baobao enhance lyrics.srt --format learn
     """
-    console.print(
-        Panel.fit(
-            f"[bold blue]🐼 Baobao Enhancement[/bold blue]\n"
-            f"Format: {format.value}, Model: {model}",
-            border_style="blue",
-        )
-    )
+    from .enhance import OutputFormat, enhance_srt
+
+    _banner("Baobao Enhancement", f"Format: {format.value}, Model: {model}")
 
     try:
         output_path = enhance_srt(
             srt_path=srt_file,
             output_path=output,
-            output_format=format,
+            output_format=OutputFormat(format.value),
             ollama_url=ollama_url,
             model=model,
+            use_cache=not no_cache,
         )
 
-        console.print("\n[bold green]✓ Done![/bold green]")
+        console.print(f"\n[bold green]{_OK} Done![/bold green]")
         console.print(f"Output: {output_path}")
 
     except ConnectionError as e:
@@ -268,19 +522,86 @@ def batch(
             help="Whisper model size",
         ),
     ] = ModelSize.LARGE,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-j",
+            min=1,
+            help="Files to transcribe in parallel (each worker loads its own model)",
+        ),
+    ] = 1,
+    batch_size: Annotated[
+        Optional[int],
+        typer.Option(
+            "--batch-size",
+            "-b",
+            min=1,
+            help="Decode audio chunks in batches with faster-whisper (no refinement)",
+        ),
+    ] = None,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Always re-run Whisper, even for previously transcribed audio",
+        ),
+    ] = False,
+    force: Annotated[
+        bool,
+        typer.Option(
+            "--force",
+            "-F",
+            help="Re-transcribe files whose .srt is already newer than the audio",
+        ),
+    ] = False,
 ):
     """
     Transcribe multiple audio files in a directory.
 
     By default, only transcribes to SRT files. Use 'baobao enhance'
-    separately to add pinyin and translations.
+    separately to add pinyin and translations. Files that already have
+    an .srt newer than the audio are skipped unless --force is given.
+
+    With --workers N, files are spread over N processes. Each worker
+    keeps one model loaded and, on multi-GPU machines, is pinned to
+    its own GPU. With --batch-size N, faster-whisper's batched pipeline
+    decodes N chunks of each song per forward pass instead of one.
 
     Examples:
         baobao batch ./songs/
         baobao batch ./songs/ --pattern "*.wav"
         baobao batch ./songs/ --model base
+        baobao batch ./songs/ --workers 2
+        baobao batch ./songs/ --batch-size 8
     """
-    files = list(directory.glob(pattern))
+    from .transcribe import (
+        Transcriber,
+        TranscriptionConfig,
+        audio_duration,
+        transcribe_audio,
+    )
+
+    # One directory read instead of glob's path building; the listing also
+    # tells us which audio files already have an SRT without extra lookups.
+    with os.scandir(directory) as it:
+        listing = {e.name: e for e in it}
+    entries = [
+        e
+        for name, e in listing.items()
+        if fnmatch.fnmatch(name, pattern) and e.is_file()
+    ]
+    srt_entries = {
+        e.name: listing[srt_name]
+        for e in entries
+        if (srt_name := Path(e.name).with_suffix(".srt").name) in listing
+    }
+    _prefetch_stats(entries + list(srt_entries.values()))
+
+    # Largest files (a cheap proxy for duration) go first so parallel
+    # workers don't finish on a single long straggler.
+    entries.sort(key=lambda e: e.stat().st_size, reverse=True)
+    files = [Path(e.path) for e in entries]
 
     if not files:
         console.print(
@@ -288,37 +609,117 @@ def batch(
         )
         raise typer.Exit(1)
 
-    console.print(
-        Panel.fit(
-            f"[bold blue]🐼 Baobao Batch Transcription[/bold blue]\n"
-            f"Files: {len(files)}\n"
-            f"Model: {model.value}",
-            border_style="blue",
-        )
+    _banner(
+        "Baobao Batch Transcription",
+        f"Files: {len(files)}\n"
+        f"Model: {model.value}\n"
+        f"Workers: {workers}, Batch size: {batch_size or 'off'}",
     )
 
     success = 0
     failed = 0
+    skipped = 0
+
+    # make-style incremental run: skip audio whose SRT is already newer
+    if not force:
+        pending = []
+        for entry in entries:
+            audio_file = Path(entry.path)
+            srt_entry = srt_entries.get(entry.name)
+            try:
+                up_to_date = (
+                    srt_entry is not None
+                    and srt_entry.stat().st_mtime >= entry.stat().st_mtime
+                )
+            except OSError:
+                up_to_date = False
+
+            if up_to_date:
+                console.print(f"[dim]Skip (up to date): {audio_file.name}[/dim]")
+                skipped += 1
+            else:
+                pending.append(audio_file)
+        files = pending
+
+    # Longest songs first by actual duration when the headers can be read;
+    # otherwise keep the size order from the pre-scan. Container opens are
+    # slower than stats on network filesystems, so overlap them the same way.
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(files))) as executor:
+            durations = dict(zip(files, executor.map(audio_duration, files)))
+    else:
+        durations = {f: audio_duration(f) for f in files}
+    if files and None not in durations.values():
+        files.sort(key=durations.get, reverse=True)
+        total = int(sum(durations.values()))
+        console.print(
+            f"[dim]Queued {len(files)} files, "
+            f"{total // 60}:{total % 60:02d} of audio[/dim]"
+        )
 
-    for i, audio_file in enumerate(files, 1):
-        console.print(f"\n[bold]({i}/{len(files)})[/bold] {audio_file.name}")
-
-        try:
-            # Transcribe only
-            transcribe_audio(
-                audio_path=audio_file,
-                model_size=model.value,
-                format="srt",
-            )
-
-            success += 1
+    if workers == 1:
+        # One transcriber for the whole run; its model loads on first use
+        # and is reused for every file (never loaded if all hit the cache)
+        transcriber = Transcriber(
+            TranscriptionConfig(model_size=model.value, batch_size=batch_size)
+        )
 
-        except Exception as e:
-            console.print(f"[red]Failed: {e}[/red]")
-            failed += 1
+        for i, audio_file in enumerate(files, 1):
+            console.print(f"\n[bold]({i}/{len(files)})[/bold] {audio_file.name}")
+
+            try:
+                # Transcribe only
+                transcribe_audio(
+                    audio_path=audio_file,
+                    format="srt",
+                    transcriber=transcriber,
+                    use_cache=not no_cache,
+                )
+
+                success += 1
+
+            except Exception as e:
+                console.print(f"[red]Failed: {e}[/red]")
+                failed += 1
+    elif files:
+        # Spawn (not fork) so each worker initializes CUDA cleanly
+        ctx = multiprocessing.get_context("spawn")
+        counter = ctx.Value("i", 0)
+
+        n_workers = min(workers, len(files))
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=ctx,
+            initializer=_init_batch_worker,
+            initargs=(model.value, batch_size, _cuda_devices(), n_workers, counter),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _transcribe_in_worker, audio_file, not no_cache
+                ): audio_file
+                for audio_file in files
+            }
+
+            for i, future in enumerate(as_completed(futures), 1):
+                audio_file = futures[future]
+                try:
+                    future.result()
+                    console.print(
+                        f"[bold]({i}/{len(files)})[/bold] "
+                        f"[green]{_OK}[/green] {audio_file.name}"
+                    )
+                    success += 1
+                except Exception as e:
+                    console.print(
+                        f"[bold]({i}/{len(files)})[/bold] "
+                        f"[red]Failed: {audio_file.name}: {e}[/red]"
+                    )
+                    failed += 1
 
     console.print(
-        f"\n[bold]Batch complete:[/bold] {success} success, {failed} failed"
+        f"\n[bold]Batch complete:[/bold] {success} success, {failed} failed, "
+        f"{skipped} up to date"
     )
 
 
@@ -351,65 +752,7 @@ def play(
         baobao play song.mp3
         baobao play song.mp3 -s song.enhanced.srt
     """
-    # Check if mpv is available
-    if not shutil.which("mpv"):
-        console.print("[bold red]Error:[/bold red] mpv not found")
-        console.print("[dim]Install with: sudo apt install mpv[/dim]")
-        raise typer.Exit(1)
-
-    # Find subtitle file if not specified
-    if subtitle is None:
-        # Look for subtitle files in order of preference
-        candidates = [
-            audio_file.with_suffix(".enhanced.srt"),
-            audio_file.with_suffix(".learn.srt"),
-            audio_file.with_suffix(".emoji.srt"),
-            audio_file.with_suffix(".srt"),
-            audio_file.with_suffix(".lrc"),
-            audio_file.with_suffix(".ttml"),
-            # Also check for .test.srt pattern
-            audio_file.with_suffix("").with_suffix(".test.enhanced.srt"),
-            audio_file.with_suffix("").with_suffix(".test.srt"),
-        ]
-
-        for candidate in candidates:
-            if candidate.exists():
-                subtitle = candidate
-                break
-
-        if subtitle is None:
-            console.print("[bold red]Error:[/bold red] No subtitle file found")
-            console.print(
-                f"[dim]Looked for: {audio_file.stem}.srt, .lrc, .ttml, etc.[/dim]"
-            )
-            console.print(
-                f"[dim]Run 'baobao {audio_file.name}' first or specify with -s[/dim]"
-            )
-            raise typer.Exit(1)
-
-    console.print(
-        Panel.fit(
-            f"[bold blue]🐼 Baobao Player[/bold blue]\n"
-            f"Audio: {audio_file.name}\n"
-            f"Subtitle: {subtitle.name}",
-            border_style="blue",
-        )
-    )
-
-    console.print("\n[dim]Starting mpv... Press 'q' to quit[/dim]\n")
-
-    # Run mpv with subtitles
-    try:
-        subprocess.run(
-            ["mpv", f"--sub-file={subtitle}", str(audio_file)], check=True
-        )
-    except subprocess.CalledProcessError as e:
-        console.print(
-            f"[bold red]Error:[/bold red] mpv exited with code {e.returncode}"
-        )
-        raise typer.Exit(1)
-    except KeyboardInterrupt:
-        pass  # User quit with Ctrl+C
+    _resolve_and_play(audio_file, subtitle, "Baobao Player")
 
 
 @app.command()
@@ -441,64 +784,7 @@ def preview(
         baobao preview song.mp3
         baobao preview song.mp3 -s song.enhanced.srt
     """
-    # Check if mpv is available
-    if not shutil.which("mpv"):
-        console.print("[bold red]Error:[/bold red] mpv not found")
-        console.print("[dim]Install with: sudo apt install mpv[/dim]")
-        raise typer.Exit(1)
-
-    # Find subtitle file if not specified
-    if subtitle is None:
-        # Look for subtitle files in order of preference
-        candidates = [
-            audio_file.with_suffix(".enhanced.srt"),
-            audio_file.with_suffix(".learn.srt"),
-            audio_file.with_suffix(".emoji.srt"),
-            audio_file.with_suffix(".srt"),
-            # Also check for .test.srt pattern
-            audio_file.with_suffix("").with_suffix(".test.enhanced.srt"),
-            audio_file.with_suffix("").with_suffix(".test.srt"),
-        ]
-
-        for candidate in candidates:
-            if candidate.exists():
-                subtitle = candidate
-                break
-
-        if subtitle is None:
-            console.print("[bold red]Error:[/bold red] No subtitle file found")
-            console.print(
-                f"[dim]Looked for: {audio_file.stem}.srt, .enhanced.srt, etc.[/dim]"
-            )
-            console.print(
-                "[dim]Run 'baobao transcribe' first or specify with -s[/dim]"
-            )
-            raise typer.Exit(1)
-
-    console.print(
-        Panel.fit(
-            f"[bold blue]🐼 Baobao Preview[/bold blue]\n"
-            f"Audio: {audio_file.name}\n"
-            f"Subtitle: {subtitle.name}",
-            border_style="blue",
-        )
-    )
-
-    console.print("\n[dim]Starting mpv... Press 'q' to quit[/dim]\n")
-
-    # Run mpv with subtitles
-    try:
-        subprocess.run(
-            ["mpv", f"--sub-file={subtitle}", str(audio_file)],
-            check=True,
-        )
-    except subprocess.CalledProcessError as e:
-        console.print(
-            f"[bold red]Error:[/bold red] mpv exited with code {e.returncode}"
-        )
-        raise typer.Exit(1)
-    except KeyboardInterrupt:
-        pass  # User quit with Ctrl+C
+    _resolve_and_play(audio_file, subtitle, "Baobao Preview", lyrics_formats=False)
 
 
 if __name__ == "__main__":
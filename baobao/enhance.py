@@ -4,7 +4,11 @@ LLM-based enhancement for Chinese lyrics.
 Adds pinyin romanization and English translations using Instructor + Ollama.
 """
 
+import functools
+import hashlib
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -13,7 +17,26 @@ from typing import Optional
 from pydantic import BaseModel, Field
 from rich.console import Console
 
-console = Console()
+console = Console(highlight=sys.stdout.isatty())
+
+
+# Subtitle markup: any tag, and the <font> highlight around the sung word
+_TAG_RE = re.compile(r"<[^>]+>")
+_FONT_RE = re.compile(r"<font[^>]*>([^<]+)</font>")
+
+
+def _strip_tags(text: str) -> str:
+    """Remove subtitle markup and surrounding whitespace."""
+    # Most lines are plain lyrics; only run the regex when there is a tag
+    return _TAG_RE.sub("", text).strip() if "<" in text else text.strip()
+
+
+# Cached: a song's lines repeat, and each phrase is looked up several times
+# (pending check, interpretation, formatting) per run
+@functools.lru_cache(maxsize=4096)
+def _phrase_digest(clean_text: str) -> str:
+    """Short stable digest of a phrase, for cache keys."""
+    return hashlib.blake2b(clean_text.encode("utf-8"), digest_size=8).hexdigest()
 
 
 # Ollama configuration defaults
@@ -48,6 +71,14 @@ class PhraseInterpretation(BaseModel):
     word_details: list[WordDetail] = Field(description="Per-character breakdown")
 
 
+class PhraseBatch(BaseModel):
+    """Interpretations for several phrases, in the order they were asked."""
+
+    results: list[PhraseInterpretation] = Field(
+        description="One interpretation per numbered phrase, in order"
+    )
+
+
 class LearningLyricLine(BaseModel):
     """Optimized lyric line for language learning."""
 
@@ -71,6 +102,51 @@ class EnhanceConfig:
     ollama_url: str = DEFAULT_OLLAMA_URL
     model: str = DEFAULT_MODEL
     output_format: OutputFormat = OutputFormat.FULL
+    max_concurrent: int = 4  # In-flight LLM requests (see OLLAMA_NUM_PARALLEL)
+    batch_size: int = 10  # Phrases per LLM request (full/emoji formats)
+
+
+# Prompts keep their fixed instructions first and the lyrics last, so the
+# leading text is byte-identical between requests and Ollama can reuse its
+# KV cache for it instead of re-reading the instructions every time.
+_PROMPT_PREAMBLE = """Analyze Chinese phrases for a children's learning song.
+
+Rules:
+- Use standard pinyin with tone marks (ā á ǎ à, ē é ě è, ī í ǐ ì, etc.)
+- word_details should have one entry per Chinese character
+- Keep translations brief and child-friendly
+"""
+
+_LEARN_PROMPT = """You are a Chinese language teacher creating sing-along lyrics.
+
+Analyze the Chinese phrase below and create the BEST learning format.
+
+Design your response to help a child:
+1. SING the pinyin correctly (spaced clearly, with tone marks)
+2. UNDERSTAND what each word means (literal word-by-word gloss)
+3. REMEMBER it (a fun tip, rhyme, or emoji memory hook)
+
+Rules for pinyin_spaced:
+- Space between each syllable: "nǐ hǎo" not "nǐhǎo"
+- Always use tone marks: ā á ǎ à, ē é ě è, ī í ǐ ì, ū ú ǔ ù, ǖ ǘ ǚ ǜ
+
+Rules for literal_gloss:
+- Match the pinyin word order exactly
+- Use simple words a child knows
+
+Rules for sing_along_tip:
+- Make it memorable! Use emojis, rhymes, or fun associations
+- Keep it SHORT (fits on one line)
+"""
+
+# Prompt guidance for the english fields, per output format
+_FORMAT_INSTRUCTIONS = {
+    OutputFormat.EMOJI: """For english fields: use 1-2 emojis + optional 1-2 word hint.
+Examples: "☀️ sunshine", "❤️ love", "😊 happy", "🌧️ rain"
+Keep it visual and minimal for children.""",
+    OutputFormat.FULL: """For english fields: use simple 2-5 word translations.
+Use simple words appropriate for children learning Chinese.""",
+}
 
 
 class ChineseEnhancer:
@@ -79,7 +155,8 @@ class ChineseEnhancer:
     def __init__(self, config: Optional[EnhanceConfig] = None):
         self.config = config or EnhanceConfig()
         self._client = None
-        self._cache: dict[str, dict] = {}
+        self._cache: dict[tuple[str, str, str], dict] = {}
+        self._failed: set[tuple] = set()  # Fallback entries, never saved to disk
 
     @property
     def client(self):
@@ -93,6 +170,40 @@ class ChineseEnhancer:
             )
         return self._client
 
+    def _cache_key(self, clean_text: str) -> tuple[str, str, str]:
+        """Cache key for a phrase: model, output format and a text digest."""
+        return (
+            self.config.model,
+            self.config.output_format.value,
+            _phrase_digest(clean_text),
+        )
+
+    def load_cache(self) -> None:
+        """Load interpretations saved by earlier runs with the same model."""
+        from . import _cache
+
+        model = self.config.model
+        saved = {
+            (model, *key.split(":", 1)): value
+            for key, value in _cache.load_phrases(model).items()
+        }
+        self._cache = {**saved, **self._cache}
+
+    def save_cache(self) -> None:
+        """Save successful interpretations for later runs with the same model."""
+        from . import _cache
+
+        # One file per model, so the model part of the key isn't stored
+        model = self.config.model
+        _cache.store_phrases(
+            model,
+            {
+                f"{fmt}:{digest}": value
+                for (key_model, fmt, digest), value in self._cache.items()
+                if key_model == model and (key_model, fmt, digest) not in self._failed
+            },
+        )
+
     def check_connection(self) -> bool:
         """Check if Ollama is accessible."""
         import requests
@@ -113,6 +224,57 @@ class ChineseEnhancer:
             console.print(f"[red]✗[/red] Cannot connect to Ollama: {e}")
             return False
 
+    def _call_llm(
+        self,
+        prompt: str,
+        response_model: type[BaseModel],
+        label: str,
+        timeout: float = 30.0,
+    ) -> Optional[BaseModel]:
+        """
+        Request structured output from the LLM over a streaming response.
+
+        Ollama's non-streaming JSON mode can stall for minutes on some
+        versions; streaming and keeping the last partial object avoids it.
+        Errors are reported (with label naming the request) and give None.
+        The default timeout suits one phrase; batches pass a larger one.
+        """
+        try:
+            partial = None
+            for partial in self.client.create_partial(
+                messages=[{"role": "user", "content": prompt}],
+                response_model=response_model,
+                max_retries=2,
+                timeout=timeout,
+            ):
+                pass
+
+            if partial is None:
+                raise ValueError("Empty response from LLM")
+            # Partial models make every field optional; check the final one
+            return response_model.model_validate(partial.model_dump())
+
+        except Exception as e:
+            console.print(f"[yellow]⚠[/yellow] LLM error for '{label}': {e}")
+            return None
+
+    def _fallback(self, clean_text: str) -> dict:
+        """Placeholder interpretation for a phrase the LLM couldn't handle."""
+        fallback = {
+            "pinyin": clean_text,
+            "english": "?",
+            "word_details": [
+                {"char": c, "pinyin": "?", "english": "?"}
+                for c in clean_text
+                if c.strip()
+            ],
+        }
+        if self.config.output_format == OutputFormat.LEARN:
+            fallback.update(
+                pinyin_spaced=clean_text, literal_gloss="?", sing_along_tip=""
+            )
+        return fallback
+
     def interpret_phrase(self, chinese_text: str) -> dict:
         """
         Get pinyin and English for a Chinese phrase.
@@ -120,151 +282,105 @@ class ChineseEnhancer:
         Uses structured output with Instructor for reliable parsing.
         """
         # Clean text (remove highlighting tags if any)
-        clean_text = re.sub(r"<[^>]+>", "", chinese_text).strip()
+        clean_text = _strip_tags(chinese_text)
 
         if not clean_text:
             return {"pinyin": "", "english": "", "word_details": []}
 
         # Check cache
-        cache_key = f"{self.config.output_format.value}:{clean_text}"
+        cache_key = self._cache_key(clean_text)
         if cache_key in self._cache:
             return self._cache[cache_key]
 
-        # Use learning-optimized format
+        # Build prompt based on output format
         if self.config.output_format == OutputFormat.LEARN:
-            return self._interpret_for_learning(clean_text, cache_key)
+            # Learning-optimized format with pedagogy focus
+            prompt = f"""{_LEARN_PROMPT}
+Chinese: {clean_text}
 
-        # Build prompt based on output format
-        if self.config.output_format == OutputFormat.EMOJI:
-            format_instruction = """For english fields: use 1-2 emojis + optional 1-2 word hint.
-Examples: "☀️ sunshine", "❤️ love", "😊 happy", "🌧️ rain"
-Keep it visual and minimal for children."""
+/no_think"""
+            response_model = LearningLyricLine
         else:
-            format_instruction = """For english fields: use simple 2-5 word translations.
-Use simple words appropriate for children learning Chinese."""
-
-        prompt = f"""Analyze this Chinese phrase for a children's learning song.
+            prompt = f"""{_PROMPT_PREAMBLE}
+{_FORMAT_INSTRUCTIONS[self.config.output_format]}
 
 Chinese: {clean_text}
 
-{format_instruction}
-
-Rules:
-- Use standard pinyin with tone marks (ā á ǎ à, ē é ě è, ī í ǐ ì, etc.)
-- word_details should have one entry per Chinese character
-- Keep translations brief and child-friendly
-
 /no_think"""
+            response_model = PhraseInterpretation
 
-        try:
-            result = self.client.create(
-                messages=[{"role": "user", "content": prompt}],
-                response_model=PhraseInterpretation,
-                max_retries=2,
-                timeout=30.0,
-            )
+        result = self._call_llm(prompt, response_model, clean_text)
 
-            result_dict = {
-                "pinyin": result.pinyin,
-                "english": result.english,
-                "word_details": [
-                    {"char": w.char, "pinyin": w.pinyin, "english": w.english}
-                    for w in result.word_details
-                ],
-            }
-
-            self._cache[cache_key] = result_dict
-            return result_dict
-
-        except Exception as e:
-            console.print(f"[yellow]⚠[/yellow] LLM error for '{clean_text}': {e}")
-            fallback = {
-                "pinyin": clean_text,
-                "english": "?",
-                "word_details": [
-                    {"char": c, "pinyin": "?", "english": "?"}
-                    for c in clean_text
-                    if c.strip()
-                ],
-            }
-            self._cache[cache_key] = fallback
-            return fallback
-
-    def _interpret_for_learning(self, clean_text: str, cache_key: str) -> dict:
-        """Get learning-optimized interpretation with pedagogy focus."""
-        prompt = f"""You are a Chinese language teacher creating sing-along lyrics.
-
-Analyze this Chinese phrase and create the BEST learning format:
-
-Chinese: {clean_text}
-
-Design your response to help a child:
-1. SING the pinyin correctly (spaced clearly, with tone marks)
-2. UNDERSTAND what each word means (literal word-by-word gloss)
-3. REMEMBER it (a fun tip, rhyme, or emoji memory hook)
+        if result is None:
+            result_dict = self._fallback(clean_text)
+            self._failed.add(cache_key)
+        else:
+            result_dict = result.model_dump()
+            if response_model is LearningLyricLine:
+                # Same keys as the other formats, for format_subtitle_line
+                result_dict["pinyin"] = result.pinyin_spaced
+                result_dict["english"] = result_dict.pop("natural_english")
 
-Rules for pinyin_spaced:
-- Space between each syllable: "nǐ hǎo" not "nǐhǎo"
-- Always use tone marks: ā á ǎ à, ē é ě è, ī í ǐ ì, ū ú ǔ ù, ǖ ǘ ǚ ǜ
+        self._cache[cache_key] = result_dict
+        return result_dict
 
-Rules for literal_gloss:
-- Match the pinyin word order exactly
-- Use simple words a child knows
+    def interpret_phrases_batch(self, phrases: list[str]) -> list[dict]:
+        """
+        Get pinyin and English for several phrases with one LLM request.
 
-Rules for sing_along_tip:
-- Make it memorable! Use emojis, rhymes, or fun associations
-- Keep it SHORT (fits on one line)
+        Falls back to one request per phrase for the learn format, or if
+        the batched answer can't be matched up with the phrases.
+        """
+        pending = []
+        for phrase in phrases:
+            clean_text = _strip_tags(phrase)
+            if (
+                clean_text
+                and self._cache_key(clean_text) not in self._cache
+                and clean_text not in pending
+            ):
+                pending.append(clean_text)
+
+        if len(pending) > 1 and self.config.output_format != OutputFormat.LEARN:
+            numbered = "\n".join(f"{i}. {p}" for i, p in enumerate(pending, 1))
+            prompt = f"""{_PROMPT_PREAMBLE}
+{_FORMAT_INSTRUCTIONS[self.config.output_format]}
+
+Return exactly one result per numbered phrase, in the same order.
+
+Chinese:
+{numbered}
 
 /no_think"""
 
-        try:
-            result = self.client.create(
-                messages=[{"role": "user", "content": prompt}],
-                response_model=LearningLyricLine,
-                max_retries=2,
-                timeout=30.0,
+            batch = self._call_llm(
+                prompt,
+                PhraseBatch,
+                f"{len(pending)} phrases",
+                timeout=30.0 * len(pending),  # Answer length grows per phrase
             )
+            if batch is not None and len(batch.results) == len(pending):
+                for clean_text, result in zip(pending, batch.results):
+                    self._cache[self._cache_key(clean_text)] = result.model_dump()
+            else:
+                console.print("[dim]Retrying batch one phrase at a time[/dim]")
 
-            result_dict = {
-                "pinyin": result.pinyin_spaced,
-                "pinyin_spaced": result.pinyin_spaced,
-                "literal_gloss": result.literal_gloss,
-                "english": result.natural_english,
-                "sing_along_tip": result.sing_along_tip,
-                "word_details": [
-                    {"char": w.char, "pinyin": w.pinyin, "english": w.english}
-                    for w in result.word_details
-                ],
-            }
-
-            self._cache[cache_key] = result_dict
-            return result_dict
-
-        except Exception as e:
-            console.print(f"[yellow]⚠[/yellow] Learning interpret error: {e}")
-            fallback = {
-                "pinyin": clean_text,
-                "pinyin_spaced": clean_text,
-                "literal_gloss": "?",
-                "english": "?",
-                "sing_along_tip": "",
-                "word_details": [
-                    {"char": c, "pinyin": "?", "english": "?"}
-                    for c in clean_text
-                    if c.strip()
-                ],
-            }
-            self._cache[cache_key] = fallback
-            return fallback
+        return [self.interpret_phrase(phrase) for phrase in phrases]
 
     def format_subtitle_line(
         self, chinese: str, highlight_idx: Optional[int] = None
     ) -> dict:
-        """Format a subtitle line with pinyin and English."""
-        clean_text = re.sub(r"<[^>]+>", "", chinese).strip()
+        """
+        Format a subtitle line with pinyin and English.
+
+        Returns the phrase's full interpretation (including learn-format
+        fields such as sing_along_tip) with pinyin highlighted to match
+        the line.
+        """
+        clean_text = _strip_tags(chinese)
 
         # Find highlighted character
-        highlight_match = re.search(r"<font[^>]*>([^<]+)</font>", chinese)
+        highlight_match = _FONT_RE.search(chinese)
         highlighted_char = highlight_match.group(1) if highlight_match else None
 
         interp = self.interpret_phrase(clean_text)
@@ -275,19 +391,28 @@ Rules for sing_along_tip:
 
         # Build pinyin line with highlighting
         if highlighted_char and word_details:
-            pinyin_parts = []
-            for detail in word_details:
-                char = detail.get("char", "")
-                py = detail.get("pinyin", "")
-                if char == highlighted_char:
-                    pinyin_parts.append(f'<font color="#00ff00">{py}</font>')
-                else:
-                    pinyin_parts.append(py)
+            pinyin_parts = [detail.get("pinyin", "") for detail in word_details]
+            # word_details has one entry per character, so the highlight's
+            # offset in the line is also its offset in pinyin_parts; this
+            # picks the sung occurrence of repeated characters
+            start = len(_TAG_RE.sub("", chinese[: highlight_match.start()]).lstrip())
+            end = start + len(highlighted_char)
+            if len(pinyin_parts) == len(clean_text) and end <= len(pinyin_parts):
+                highlighted = range(start, end)
+            else:
+                highlighted = [
+                    i
+                    for i, detail in enumerate(word_details)
+                    if detail.get("char", "") == highlighted_char
+                ]
+            for i in highlighted:
+                pinyin_parts[i] = f'<font color="#00ff00">{pinyin_parts[i]}</font>'
             pinyin_highlighted = " ".join(pinyin_parts)
         else:
             pinyin_highlighted = pinyin
 
         return {
+            **interp,
             "chinese": chinese,
             "pinyin": pinyin_highlighted,
             "pinyin_plain": pinyin,
@@ -302,6 +427,7 @@ def enhance_srt(
     output_format: OutputFormat = OutputFormat.FULL,
     ollama_url: str = DEFAULT_OLLAMA_URL,
     model: str = DEFAULT_MODEL,
+    use_cache: bool = False,
 ) -> Path:
     """
     Enhance an SRT file with pinyin and translations.
@@ -312,6 +438,7 @@ def enhance_srt(
         output_format: Output format (full, emoji, or learn)
         ollama_url: Ollama API URL
         model: LLM model name
+        use_cache: Reuse interpretations saved by earlier runs with this model
 
     Returns:
         Path to enhanced SRT file
@@ -329,6 +456,9 @@ def enhance_srt(
     if not enhancer.check_connection():
         raise ConnectionError("Cannot connect to Ollama. Is it running?")
 
+    if use_cache:
+        enhancer.load_cache()
+
     console.print(f"\n[bold]Enhancing:[/bold] {srt_path.name}")
     console.print(f"[dim]Format: {output_format.value}, Model: {model}[/dim]")
 
@@ -339,32 +469,44 @@ def enhance_srt(
     entries = _parse_srt(content)
     console.print(f"[dim]Found {len(entries)} subtitle entries[/dim]")
 
-    # Pre-interpret unique phrases for caching
-    unique_phrases = set()
-    for entry in entries:
-        clean = re.sub(r"<[^>]+>", "", entry.get("text", "")).strip()
-        if clean:
-            unique_phrases.add(clean)
+    # Pre-interpret the phrases the cache doesn't have yet
+    unique_phrases = {_strip_tags(entry.get("text", "")) for entry in entries} - {""}
+    phrases = sorted(
+        p for p in unique_phrases if enhancer._cache_key(p) not in enhancer._cache
+    )
 
-    console.print(f"[dim]Unique phrases: {len(unique_phrases)}[/dim]")
+    console.print(
+        f"[dim]Unique phrases: {len(unique_phrases)} "
+        f"({len(unique_phrases) - len(phrases)} cached)[/dim]"
+    )
 
-    with console.status("[bold blue]Interpreting phrases..."):
-        for phrase in unique_phrases:
-            enhancer.interpret_phrase(phrase)
+    # Requests spend almost all their time waiting on Ollama, so a few
+    # threads overlap those waits; results land in the enhancer's cache.
+    # Fully cached songs skip this (and never create the LLM client).
+    if phrases:
+        batches = [
+            phrases[i : i + config.batch_size]
+            for i in range(0, len(phrases), config.batch_size)
+        ]
+        with console.status("[bold blue]Interpreting phrases..."):
+            enhancer.client  # Create the shared client before threads race for it
+            with ThreadPoolExecutor(max_workers=config.max_concurrent) as executor:
+                list(executor.map(enhancer.interpret_phrases_batch, batches))
+
+        if use_cache:
+            enhancer.save_cache()
 
     # Build enhanced entries
     enhanced_entries = []
     for entry in entries:
-        text = entry.get("text", "")
-        result = enhancer.format_subtitle_line(text)
-        interp = enhancer.interpret_phrase(re.sub(r"<[^>]+>", "", text).strip())
+        result = enhancer.format_subtitle_line(entry.get("text", ""))
 
         if output_format == OutputFormat.LEARN:
             lines = [
                 result["pinyin"],
                 result["chinese"],
-                interp.get("sing_along_tip", "")
-                or f"({interp.get('literal_gloss', interp.get('english', ''))})",
+                result.get("sing_along_tip", "")
+                or f"({result.get('literal_gloss', result['english'])})",
             ]
         else:
             lines = [
@@ -395,10 +537,12 @@ def enhance_srt(
 
     # Write enhanced SRT
     with open(output_path, "w", encoding="utf-8") as f:
-        for entry in enhanced_entries:
-            f.write(f"{entry['index']}\n")
-            f.write(f"{entry['timestamp']}\n")
-            f.write(f"{entry['text']}\n\n")
+        f.write(
+            "".join(
+                f"{entry['index']}\n{entry['timestamp']}\n{entry['text']}\n\n"
+                for entry in enhanced_entries
+            )
+        )
 
     console.print(f"[green]✓[/green] Saved: {output_path}")
     return output_path
@@ -408,21 +552,28 @@ def _parse_srt(content: str) -> list[dict]:
     """Parse SRT content into entries."""
     entries = []
     current_entry = {}
+    text_lines = []
 
-    for line in content.split("\n"):
+    def finish_entry():
+        if text_lines:
+            current_entry["text"] = "".join(text_lines)
+            text_lines.clear()
+        entries.append(current_entry)
+
+    for line in content.splitlines():
         line = line.strip()
         if not line:
             if current_entry:
-                entries.append(current_entry)
+                finish_entry()
                 current_entry = {}
         elif line.isdigit() and not current_entry:
             current_entry["index"] = int(line)
         elif "-->" in line:
             current_entry["timestamp"] = line
         elif current_entry:
-            current_entry["text"] = current_entry.get("text", "") + line
+            text_lines.append(line)
 
     if current_entry:
-        entries.append(current_entry)
+        finish_entry()
 
     return entries
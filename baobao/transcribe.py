@@ -4,6 +4,8 @@ Core transcription module using stable-ts + faster-whisper.
 Produces time-synced Chinese lyrics in SRT/LRC format.
 """
 
+import functools
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -11,7 +13,41 @@ from typing import Optional
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+console = Console(highlight=sys.stdout.isatty())
+
+# Karaoke highlight around the word being sung
+_FONT_OPEN = '<font color="#00ff00">'
+_FONT_CLOSE = "</font>"
+
+
+def _find_word(text: str, word: str, start: int) -> int:
+    """
+    Find word in text at or after start, or -1.
+
+    Latin words must stand alone (e.g., "a" doesn't match inside "Mary");
+    Chinese has no spaces between words, so CJK words match anywhere.
+    """
+    pos = text.find(word, start)
+    if not word.isascii():
+        return pos
+    while pos != -1:
+        end = pos + len(word)
+        if not (pos and text[pos - 1].isalnum()) and not (
+            end < len(text) and text[end].isalnum()
+        ):
+            return pos
+        pos = text.find(word, pos + 1)
+    return -1
+
+
+# Cached: in karaoke output each word's end is usually the next word's start
+@functools.lru_cache(maxsize=8192)
+def _srt_timestamp(ms: int) -> str:
+    """Format integer milliseconds as SRT timestamp (HH:MM:SS,mmm)."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
 @dataclass
@@ -24,6 +60,8 @@ class TranscriptionConfig:
     beam_size: int = 5
     refine_timestamps: bool = True  # More precise, slower
     word_level: bool = True  # Word-level timestamps for karaoke
+    batch_size: Optional[int] = None  # Batched faster-whisper inference (no refine)
+    compute_type: str = "auto"  # faster-whisper precision (int8 on CPU, fp16 on GPU)
 
     # Segment grouping - avoids too-granular subtitles
     min_segment_duration: float = 1.0  # Minimum seconds per subtitle
@@ -51,12 +89,29 @@ class Transcriber:
     def model(self):
         """Lazy-load the whisper model."""
         if self._model is None:
-            import stable_whisper
-
             console.print(
                 f"[bold blue]Loading {self.config.model_size} model...[/bold blue]"
             )
-            self._model = stable_whisper.load_model(self.config.model_size)
+            if self.config.batch_size:
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+                self._model = BatchedInferencePipeline(
+                    model=WhisperModel(
+                        self.config.model_size, compute_type=self.config.compute_type
+                    )
+                )
+            elif not self.config.refine_timestamps:
+                # Refinement needs the PyTorch model; without it, stable-ts
+                # can drive a quantized CTranslate2 (faster-whisper) model
+                import stable_whisper
+
+                self._model = stable_whisper.load_faster_whisper(
+                    self.config.model_size, compute_type=self.config.compute_type
+                )
+            else:
+                import stable_whisper
+
+                self._model = stable_whisper.load_model(self.config.model_size)
             console.print(f"[green]✓[/green] Model loaded: {self.config.model_size}")
         return self._model
 
@@ -77,6 +132,9 @@ class Transcriber:
         console.print(f"\n[bold]Transcribing:[/bold] {audio_path.name}")
         console.print(f"[dim]Model: {self.config.model_size}[/dim]")
 
+        if self.config.batch_size:
+            return self._transcribe_batched(audio_path)
+
         # Transcribe with Chinese language hint
         console.print("[bold blue]Transcribing audio...[/bold blue]")
         result = self.model.transcribe(
@@ -117,6 +175,42 @@ class Transcriber:
         console.print(f"[dim]Found {len(segments)} segments[/dim]")
         return segments
 
+    def _transcribe_batched(self, audio_path: Path) -> list[LyricSegment]:
+        """Transcribe with faster-whisper, decoding audio chunks in batches."""
+        console.print(
+            f"[bold blue]Transcribing audio (batch size "
+            f"{self.config.batch_size})...[/bold blue]"
+        )
+        result, _info = self.model.transcribe(
+            str(audio_path),
+            language=self.config.language,
+            vad_filter=self.config.vad,
+            beam_size=self.config.beam_size,
+            word_timestamps=self.config.word_level,
+            batch_size=self.config.batch_size,
+        )
+
+        segments = []
+        for seg in result:  # Generator: decoding happens while iterating
+            words = None
+            if self.config.word_level and seg.words:
+                words = [
+                    {"start": w.start, "end": w.end, "word": w.word} for w in seg.words
+                ]
+
+            segments.append(
+                LyricSegment(
+                    start=seg.start,
+                    end=seg.end,
+                    text=seg.text.strip(),
+                    words=words,
+                )
+            )
+
+        console.print("[green]✓[/green] Transcription complete")
+        console.print(f"[dim]Found {len(segments)} segments[/dim]")
+        return segments
+
     def save_srt(
         self,
         segments: list[LyricSegment],
@@ -136,7 +230,9 @@ class Transcriber:
         """
         output_path = Path(output_path)
 
-        with open(output_path, "w", encoding="utf-8") as f:
+        # Binary: the writers encode the whole file once, skipping the text
+        # layer's chunked encoding and newline translation
+        with open(output_path, "wb") as f:
             if word_highlight:
                 self._write_srt_word_highlight(f, segments)
             else:
@@ -147,61 +243,67 @@ class Transcriber:
 
     def _write_srt_simple(self, f, segments: list[LyricSegment]):
         """Write simple SRT without word highlighting."""
+        ts = _srt_timestamp  # Skips the _format_srt_time frame per timestamp
+        parts = []
         for i, seg in enumerate(segments, 1):
-            start = self._format_srt_time(seg.start)
-            end = self._format_srt_time(seg.end)
-            f.write(f"{i}\n{start} --> {end}\n{seg.text}\n\n")
+            start = ts(round(seg.start * 1000))
+            end = ts(round(seg.end * 1000))
+            parts.append(f"{i}\n{start} --> {end}\n{seg.text}\n\n")
+        f.write("".join(parts).encode("utf-8"))
 
     def _write_srt_word_highlight(self, f, segments: list[LyricSegment]):
         """Write SRT with karaoke-style word highlighting."""
+        # One entry per word adds up; build the file and write it once
+        ts = _srt_timestamp
+        parts = []
         idx = 1
         for seg in segments:
             if not seg.words:
                 # No word-level timing, write as simple segment
-                start = self._format_srt_time(seg.start)
-                end = self._format_srt_time(seg.end)
-                f.write(f"{idx}\n{start} --> {end}\n{seg.text}\n\n")
+                start = ts(round(seg.start * 1000))
+                end = ts(round(seg.end * 1000))
+                parts.append(f"{idx}\n{start} --> {end}\n{seg.text}\n\n")
                 idx += 1
                 continue
 
             # Create subtitle for each word with highlighting
             full_text = seg.text
+            cursor = 0  # Words come in order; search only past the last one
             for word_info in seg.words:
                 word = word_info["word"].strip()
                 if not word:
                     continue
 
-                start = self._format_srt_time(word_info["start"])
-                end = self._format_srt_time(word_info["end"])
-
-                # Highlight current word using word boundary matching
-                # This prevents matching partial words (e.g., "a" inside "Mary")
-                import re
-
-                # Escape special regex characters in the word
-                escaped_word = re.escape(word)
-
-                # Use word boundaries to match only complete words
-                # \b matches word boundaries (start/end of word)
-                pattern = rf'\b{escaped_word}\b'
-
-                highlighted = re.sub(
-                    pattern,
-                    f'<font color="#00ff00">{word}</font>',
-                    full_text,
-                    count=1,  # Only replace first occurrence
-                )
-
-                f.write(f"{idx}\n{start} --> {end}\n{highlighted}\n\n")
+                start = ts(round(word_info["start"] * 1000))
+                end = ts(round(word_info["end"] * 1000))
+
+                # Locating each word after the previous one highlights the
+                # right occurrence of repeated words. The cursor only moves
+                # when a word is found (Whisper's word text can differ from
+                # seg.text), so _find_word also rejects partial-word matches
+                pos = _find_word(full_text, word, cursor)
+                parts.append(f"{idx}\n{start} --> {end}\n")
+                if pos == -1:
+                    parts.append(full_text)
+                else:
+                    # Pieces go straight into parts; the final join copies
+                    # them once instead of concatenating a line per word
+                    cursor = pos + len(word)
+                    parts += (
+                        full_text[:pos],
+                        _FONT_OPEN,
+                        word,
+                        _FONT_CLOSE,
+                        full_text[cursor:],
+                    )
+                parts.append("\n\n")
                 idx += 1
 
+        f.write("".join(parts).encode("utf-8"))
+
     def _format_srt_time(self, seconds: float) -> str:
         """Format seconds as SRT timestamp (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        return _srt_timestamp(round(seconds * 1000))
 
     def save_lrc(self, segments: list[LyricSegment], output_path: str | Path) -> Path:
         """
@@ -216,11 +318,14 @@ class Transcriber:
         """
         output_path = Path(output_path)
 
+        lines = []
+        for seg in segments:
+            mins = int(seg.start // 60)
+            secs = seg.start % 60
+            lines.append(f"[{mins:02d}:{secs:05.2f}]{seg.text}\n")
+
         with open(output_path, "w", encoding="utf-8") as f:
-            for seg in segments:
-                mins = int(seg.start // 60)
-                secs = seg.start % 60
-                f.write(f"[{mins:02d}:{secs:05.2f}]{seg.text}\n")
+            f.write("".join(lines))
 
         console.print(f"[green]✓[/green] Saved: {output_path}")
         return output_path
@@ -232,6 +337,10 @@ def transcribe_audio(
     model_size: str = "large-v3",
     format: str = "srt",
     word_highlight: bool = False,
+    batch_size: Optional[int] = None,
+    refine: bool = True,
+    transcriber: Optional[Transcriber] = None,
+    use_cache: bool = False,
 ) -> Path:
     """
     Convenience function to transcribe audio and save output.
@@ -242,6 +351,12 @@ def transcribe_audio(
         model_size: Whisper model size
         format: Output format ('srt' or 'lrc')
         word_highlight: Enable karaoke-style word highlighting (SRT only)
+        batch_size: Use faster-whisper batched inference with this batch size
+        refine: Refine timestamps after transcribing (slower, more precise);
+            without it a quantized faster-whisper model is used
+        transcriber: Reuse an already-loaded transcriber (overrides model_size,
+            batch_size and refine)
+        use_cache: Reuse a previous transcript of identical audio and settings
 
     Returns:
         Path to output file
@@ -251,15 +366,73 @@ def transcribe_audio(
     if output_path is None:
         ext = ".srt" if format == "srt" else ".lrc"
         output_path = audio_path.with_suffix(ext)
+    output_path = Path(output_path)
 
-    config = TranscriptionConfig(model_size=model_size)
-    transcriber = Transcriber(config)
+    if transcriber is None:
+        config = TranscriptionConfig(
+            model_size=model_size, batch_size=batch_size, refine_timestamps=refine
+        )
+        transcriber = Transcriber(config)
+
+    cache_key = None
+    if use_cache:
+        from . import _cache
+
+        cache_key = _cache.transcript_key(
+            audio_path,
+            model_size=transcriber.config.model_size,
+            format=format,
+            word_highlight=word_highlight,
+            batch_size=transcriber.config.batch_size,
+            refine=transcriber.config.refine_timestamps,
+        )
+        if _cache.restore(cache_key, output_path):
+            console.print(f"[green]✓[/green] Cached: {output_path}")
+            return output_path
 
     segments = transcriber.transcribe(audio_path)
 
     if format == "srt":
-        return transcriber.save_srt(
+        result = transcriber.save_srt(
             segments, output_path, word_highlight=word_highlight
         )
     else:
-        return transcriber.save_lrc(segments, output_path)
+        result = transcriber.save_lrc(segments, output_path)
+
+    if cache_key:
+        _cache.store(cache_key, result)
+    return result
+
+
+def audio_duration(audio_path: str | Path) -> Optional[float]:
+    """
+    Read an audio file's duration from its container header.
+
+    Uses PyAV (installed with faster-whisper), falling back to mutagen if
+    available. Nothing is decoded, so this is cheap enough to run over a
+    whole batch before transcribing.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Duration in seconds, or None if it can't be determined
+    """
+    try:
+        import av
+
+        with av.open(str(audio_path)) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        import mutagen
+
+        info = mutagen.File(audio_path)
+        return info.info.length if info is not None else None
+    except Exception:
+        return None
@@ -0,0 +1,13 @@
+"""
+SRT helpers shared by the test scripts.
+"""
+
+
+def format_srt_time(seconds: float) -> str:
+    """Format seconds as SRT timestamp (HH:MM:SS,mmm)."""
+    # Rounding once to whole milliseconds keeps every field consistent,
+    # e.g. 1.9996 becomes 00:00:02,000 rather than 00:00:01,999
+    s, ms = divmod(round(seconds * 1000), 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
@@ -0,0 +1,25 @@
+"""
+Whisper model shared by the test scripts.
+
+Loading a model is the slowest step of a test run, so it is cached per
+process: scripts run together through run_all.py reuse the first load.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=2)
+def get_model(model_size: str = "base") -> object:
+    """Load (once per process) a batched faster-whisper pipeline."""
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+    import ctranslate2
+
+    # int8 weights: a quarter of the fp32 size to load, and int8 GEMMs on CPU
+    cuda = ctranslate2.get_cuda_device_count() > 0
+    compute_type = "int8_float16" if cuda else "int8"
+
+    print(f"  Loading Whisper model: {model_size} ({compute_type})")
+    return BatchedInferencePipeline(
+        model=WhisperModel(model_size, device="auto", compute_type=compute_type)
+    )
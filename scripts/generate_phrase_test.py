@@ -35,16 +35,20 @@ async def generate_phrase_audio():
 
     sentence_timings = []
 
-    with open(output_path, "wb") as audio_file:
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_file.write(chunk["data"])
-            elif chunk["type"] == "SentenceBoundary":
-                sentence_timings.append({
-                    "text": chunk["text"],
-                    "start_ms": chunk["offset"] / 10000,
-                    "duration_ms": chunk["duration"] / 10000
-                })
+    # Buffer audio in memory and write once, so disk writes don't stall
+    # the event loop while TTS chunks are still streaming in
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio += chunk["data"]
+        elif chunk["type"] == "SentenceBoundary":
+            sentence_timings.append({
+                "text": chunk["text"],
+                "start_ms": chunk["offset"] / 10000,
+                "duration_ms": chunk["duration"] / 10000
+            })
+
+    output_path.write_bytes(audio)
 
     print(f"✓ Audio generated: {output_path} ({output_path.stat().st_size / 1024:.1f} KB)")
     print(f"\nExpected behavior in karaoke mode:")
@@ -15,17 +15,9 @@ Usage:
 """
 
 import asyncio
-import json
 from pathlib import Path
 
-
-def format_srt_time(seconds: float) -> str:
-    """Format seconds as SRT timestamp."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+from pydantic_core import to_json
 
 
 async def generate_timed_audio():
@@ -52,33 +44,38 @@ async def generate_timed_audio():
 
     sentence_timings = []
 
-    with open(output_path, "wb") as audio_file:
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_file.write(chunk["data"])
-            elif chunk["type"] == "SentenceBoundary":
-                # Capture sentence timing from TTS
-                sentence_timings.append({
-                    "text": chunk["text"],
-                    "start_ms": chunk["offset"] / 10000,
-                    "duration_ms": chunk["duration"] / 10000
-                })
-                print(f"  Sentence: '{chunk['text']}' at {chunk['offset'] / 10000:.0f}ms")
+    # Buffer audio in memory and write once, so disk writes don't stall
+    # the event loop while TTS chunks are still streaming in
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio += chunk["data"]
+        elif chunk["type"] == "SentenceBoundary":
+            # Capture sentence timing from TTS
+            sentence_timings.append({
+                "text": chunk["text"],
+                "start_ms": chunk["offset"] / 10000,
+                "duration_ms": chunk["duration"] / 10000
+            })
+            print(f"  Sentence: '{chunk['text']}' at {chunk['offset'] / 10000:.0f}ms")
+
+    output_path.write_bytes(audio)
 
     print(f"✓ Audio generated: {output_path} ({output_path.stat().st_size / 1024:.1f} KB)")
     print(f"✓ Captured {len(sentence_timings)} sentence timing events")
 
     # Save metadata
+    # pydantic-core's Rust serializer (already a baobao dependency) keeps
+    # this fast if the metadata grows to per-word ground truth
     metadata_path = output_path.with_suffix(".metadata.json")
-    with open(metadata_path, "w") as f:
-        json.dump({
-            "audio_file": str(output_path),
-            "voice": voice,
-            "text": text,
-            "sentence_timings": sentence_timings,
-            "expected_words": ["one", "two", "three", "four", "five"],
-            "note": "edge-tts v7+ only provides sentence-level timing. Use Whisper transcription for word-level validation."
-        }, f, indent=2)
+    metadata_path.write_bytes(to_json({
+        "audio_file": str(output_path),
+        "voice": voice,
+        "text": text,
+        "sentence_timings": sentence_timings,
+        "expected_words": ["one", "two", "three", "four", "five"],
+        "note": "edge-tts v7+ only provides sentence-level timing. Use Whisper transcription for word-level validation."
+    }, indent=2))
 
     print(f"✓ Metadata: {metadata_path}")
 
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Run the Chinese end-to-end and English transcription tests in one process.
+
+Both tests share one Whisper model (see _whisper_pool.py), so it is only
+loaded once instead of once per script.
+
+Usage:
+    python scripts/run_all.py            # Full run with LLM enhancement
+    python scripts/run_all.py --no-llm   # Local pinyin only (needs pypinyin)
+"""
+
+import asyncio
+import sys
+
+import test_e2e_transcription
+import test_english_transcription
+
+
+async def run_all(use_llm: bool = True) -> bool:
+    """Run both tests; True if the end-to-end test passed."""
+    success = await test_e2e_transcription.run_e2e_test(use_llm=use_llm)
+    await test_english_transcription.main()
+    return success
+
+
+def main():
+    """Main entry point."""
+    success = asyncio.run(run_all(use_llm="--no-llm" not in sys.argv[1:]))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,16 @@ Usage:
 """
 
 import asyncio
+import io
 from pathlib import Path
+from typing import BinaryIO
 
+from _srt_utils import format_srt_time
+from _whisper_pool import get_model
 
-async def generate_english_audio(output_path: Path) -> Path:
-    """Generate English audio using edge-tts."""
+
+async def generate_english_audio(output_path: Path | None = None) -> io.BytesIO:
+    """Generate English audio using edge-tts, kept in memory for Whisper."""
     import edge_tts
 
     # Clear, simple English phrases with pauses
@@ -30,75 +35,98 @@ async def generate_english_audio(output_path: Path) -> Path:
 
     print(f"Generating audio with voice: {voice}")
     communicate = edge_tts.Communicate(text.strip(), voice, rate="-10%")
-    await communicate.save(str(output_path))
-
-    print(f"✓ Audio saved: {output_path} ({output_path.stat().st_size / 1024:.1f} KB)")
-    return output_path
-
-
-def transcribe_english(audio_path: Path, output_dir: Path) -> Path:
-    """Transcribe English audio and save SRT."""
-    import stable_whisper
-
-    print(f"\nLoading Whisper model (base)...")
-    model = stable_whisper.load_model("base")
-
-    print(f"Transcribing: {audio_path.name}")
-    result = model.transcribe(
-        str(audio_path),
+    audio = io.BytesIO()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.write(chunk["data"])
+
+    size_kb = audio.getbuffer().nbytes / 1024
+    # The file is only for playback; Whisper reads the in-memory copy
+    if output_path:
+        output_path.write_bytes(audio.getbuffer())
+        print(f"✓ Audio saved: {output_path} ({size_kb:.1f} KB)")
+    else:
+        print(f"✓ Audio generated ({size_kb:.1f} KB)")
+
+    audio.seek(0)
+    return audio
+
+
+def transcribe_english(
+    audio: BinaryIO, output_dir: Path, model, batch_size: int = 8
+) -> Path:
+    """Transcribe English audio with a preloaded model and save SRT."""
+    from types import SimpleNamespace
+
+    # Speech chunks are decoded batch_size at a time; word_timestamps
+    # replaces stable-ts refinement, which needs a stable-ts result
+    print(f"Transcribing (batch size {batch_size})")
+    segments, _info = model.transcribe(
+        audio,
         language="en",
-        vad=True,
-        regroup=True,
+        batch_size=batch_size,
+        word_timestamps=True,
     )
-
-    # Refine timestamps
-    print("Refining timestamps...")
-    model.refine(str(audio_path), result)
+    result = SimpleNamespace(segments=list(segments))
 
     # Save simple SRT
     srt_path = output_dir / "english_test.srt"
-    with open(srt_path, "w", encoding="utf-8") as f:
-        for i, seg in enumerate(result.segments, 1):
-            start = format_srt_time(seg.start)
-            end = format_srt_time(seg.end)
-            f.write(f"{i}\n{start} --> {end}\n{seg.text.strip()}\n\n")
+    out: list[str] = []
+    for i, seg in enumerate(result.segments, 1):
+        start = format_srt_time(seg.start)
+        end = format_srt_time(seg.end)
+        out.append(f"{i}\n{start} --> {end}\n{seg.text.strip()}\n\n")
+    with open(srt_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(out)
 
     print(f"✓ SRT saved: {srt_path}")
 
     # Save word-level SRT
     word_srt_path = output_dir / "english_test.words.srt"
-    with open(word_srt_path, "w", encoding="utf-8") as f:
-        idx = 1
-        for seg in result.segments:
-            if hasattr(seg, "words") and seg.words:
-                full_text = seg.text.strip()
-                for word in seg.words:
-                    w = word.word.strip()
-                    if not w:
-                        continue
-                    start = format_srt_time(word.start)
-                    end = format_srt_time(word.end)
-                    # Highlight current word
-                    highlighted = full_text.replace(
-                        w, f'<font color="#00ff00">{w}</font>', 1
+    out = []
+    idx = 1
+    for seg in result.segments:
+        if hasattr(seg, "words") and seg.words:
+            full_text = seg.text.strip()
+            cursor = 0  # Words come in order; search only past the last one
+            for word in seg.words:
+                w = word.word.strip()
+                if not w:
+                    continue
+                start = format_srt_time(word.start)
+                end = format_srt_time(word.end)
+                # Highlight current word (the occurrence after the last one)
+                i = full_text.find(w, cursor)
+                if i == -1:
+                    highlighted = full_text
+                else:
+                    cursor = i + len(w)
+                    highlighted = (
+                        full_text[:i]
+                        + f'<font color="#00ff00">{w}</font>'
+                        + full_text[cursor:]
                     )
-                    f.write(f"{idx}\n{start} --> {end}\n{highlighted}\n\n")
-                    idx += 1
-            else:
-                start = format_srt_time(seg.start)
-                end = format_srt_time(seg.end)
-                f.write(f"{idx}\n{start} --> {end}\n{seg.text.strip()}\n\n")
+                out.append(f"{idx}\n{start} --> {end}\n{highlighted}\n\n")
                 idx += 1
+        else:
+            start = format_srt_time(seg.start)
+            end = format_srt_time(seg.end)
+            out.append(f"{idx}\n{start} --> {end}\n{seg.text.strip()}\n\n")
+            idx += 1
+    with open(word_srt_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(out)
 
     print(f"✓ Word-level SRT saved: {word_srt_path}")
 
     # Save LRC
     lrc_path = output_dir / "english_test.lrc"
-    with open(lrc_path, "w", encoding="utf-8") as f:
-        for seg in result.segments:
-            mins = int(seg.start // 60)
-            secs = seg.start % 60
-            f.write(f"[{mins:02d}:{secs:05.2f}]{seg.text.strip()}\n")
+    out = []
+    for seg in result.segments:
+        mins = int(seg.start // 60)
+        secs = seg.start % 60
+        out.append(f"[{mins:02d}:{secs:05.2f}]{seg.text.strip()}\n")
+    with open(lrc_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(out)
 
     print(f"✓ LRC saved: {lrc_path}")
 
@@ -119,15 +147,6 @@ def transcribe_english(audio_path: Path, output_dir: Path) -> Path:
     return srt_path
 
 
-def format_srt_time(seconds: float) -> str:
-    """Format seconds as SRT timestamp."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-
 async def main():
     """Run the English transcription test."""
     print("\n" + "=" * 60)
@@ -140,13 +159,16 @@ async def main():
 
     audio_path = output_dir / "english_test.mp3"
 
-    # Step 1: Generate audio
+    # Step 1: Generate audio, loading the model in a thread meanwhile so
+    # its disk load hides behind the TTS download
     print("Step 1: Generating English test audio...")
-    await generate_english_audio(audio_path)
+    model, audio = await asyncio.gather(
+        asyncio.to_thread(get_model, "base"), generate_english_audio(audio_path)
+    )
 
     # Step 2: Transcribe
     print("\nStep 2: Transcribing with Whisper...")
-    srt_path = transcribe_english(audio_path, output_dir)
+    srt_path = transcribe_english(audio, output_dir, model)
 
     print("\n" + "=" * 60)
     print("  TEST COMPLETE")
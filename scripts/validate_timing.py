@@ -27,13 +27,15 @@ Notes:
     - Use --expected 1 2 3 4 5 when validating base model output
 """
 
+import heapq
 import re
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)  # No per-entry __dict__; karaoke SRTs have one entry per word
 class SRTEntry:
     """Represents a single SRT subtitle entry."""
     index: int
@@ -61,55 +63,97 @@ def parse_srt_time(time_str: str) -> float:
     return hours * 3600 + minutes * 60 + seconds
 
 
-def parse_srt(srt_path: Path) -> list[SRTEntry]:
-    """
-    Parse SRT file into structured entries.
+# As lenient as parse_srt_time: any digit counts, optional fraction
+# (00:00:01,5 is 1.5 s, as a decimal fraction)
+_TIMESTAMP_RE = re.compile(
+    r"(\d+):(\d+):(\d+)(?:[,.](\d+))?\s*-->\s*(\d+):(\d+):(\d+)(?:[,.](\d+))?"
+)
 
-    Returns:
-        List of SRTEntry objects
-    """
-    with open(srt_path, encoding="utf-8") as f:
-        content = f.read()
 
-    entries = []
-    blocks = content.strip().split("\n\n")
+_TAG_RE = re.compile(r"<[^>]+>")
+_HIGHLIGHT_OPEN = '<font color="#00ff00">'
+
+
+_PUNCTUATION = ".,!?;:"
+
+
+def _strip_tags(raw_text: str) -> str:
+    """Remove HTML tags, using plain replaces for the word-highlight tags."""
+    if "<" not in raw_text:
+        return raw_text
+    text = raw_text.replace(_HIGHLIGHT_OPEN, "").replace("</font>", "")
+    return _TAG_RE.sub("", text) if "<" in text else text
+
+
+def _parse_block(lines: list[str]) -> SRTEntry | None:
+    """Parse one subtitle block (index, timestamp, text lines)."""
+    if len(lines) < 3:
+        return None
+
+    try:
+        # Line 0: entry number
+        index = int(lines[0])
 
-    for block in blocks:
-        if not block.strip():
-            continue
+        # Line 1: timestamp (00:00:01,000 --> 00:00:02,000)
+        match = _TIMESTAMP_RE.match(lines[1].strip())
+        if not match:
+            raise ValueError(f"Bad timestamp line: {lines[1]!r}")
+        h1, m1, s1, ms1, h2, m2, s2, ms2 = match.groups()
+        # Same arithmetic as parse_srt_time, so results match to the bit
+        start = int(h1) * 3600 + int(m1) * 60 + float(f"{s1}.{ms1 or 0}")
+        end = int(h2) * 3600 + int(m2) * 60 + float(f"{s2}.{ms2 or 0}")
 
-        lines = block.strip().split("\n")
-        if len(lines) < 3:
-            continue
+        # Line 2+: subtitle text
+        raw_text = " ".join(lines[2:]).strip()
 
-        try:
-            # Line 0: entry number
-            index = int(lines[0])
+        # Strip HTML tags for analysis
+        text = _strip_tags(raw_text)
 
-            # Line 1: timestamp (00:00:01,000 --> 00:00:02,000)
-            timestamp_line = lines[1]
-            start_str, end_str = timestamp_line.split(" --> ")
-            start = parse_srt_time(start_str)
-            end = parse_srt_time(end_str)
+        return SRTEntry(
+            index=index,
+            start=start,
+            end=end,
+            text=text.strip(),
+            raw_text=raw_text
+        )
+    except Exception as e:
+        block = "\n".join(lines)
+        print(f"Warning: Failed to parse entry in block:\n{block}\nError: {e}")
+        return None
 
-            # Line 2+: subtitle text
-            raw_text = " ".join(lines[2:])
 
-            # Strip HTML tags for analysis
-            text = re.sub(r'<[^>]+>', '', raw_text)
+def iter_srt(srt_path: Path) -> Iterator[SRTEntry]:
+    """
+    Parse an SRT file one block at a time.
+
+    Reads line by line, so only the current block is held in memory.
+
+    Yields:
+        SRTEntry objects in file order
+    """
+    lines = []
+    with open(srt_path, encoding="utf-8", buffering=1 << 16) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                if entry := _parse_block(lines):
+                    yield entry
+                lines = []
 
-            entries.append(SRTEntry(
-                index=index,
-                start=start,
-                end=end,
-                text=text.strip(),
-                raw_text=raw_text
-            ))
-        except Exception as e:
-            print(f"Warning: Failed to parse entry in block:\n{block}\nError: {e}")
-            continue
+    if lines and (entry := _parse_block(lines)):
+        yield entry
 
-    return entries
+
+def parse_srt(srt_path: Path) -> list[SRTEntry]:
+    """
+    Parse SRT file into structured entries.
+
+    Returns:
+        List of SRTEntry objects
+    """
+    return list(iter_srt(srt_path))
 
 
 def validate_format(entries: list[SRTEntry], expected_words: list[str] | None = None) -> dict:
@@ -122,13 +166,28 @@ def validate_format(entries: list[SRTEntry], expected_words: list[str] | None =
     issues = []
     warnings = []
 
+    # Each timing check is a single pass over these lists
+    starts = [e.start for e in entries]
+    ends = [e.end for e in entries]
+    durations = [end - start for start, end in zip(starts, ends)]
+    # gaps[i]: entry i's end to entry i+1's start
+    gaps = [start - end for start, end in zip(starts[1:], ends)]
+
     # Check 1: Overlapping entries
-    overlaps = []
-    for i, entry in enumerate(entries):
-        for j in range(i + 1, len(entries)):
-            other = entries[j]
-            if entry.overlaps_with(other):
-                overlaps.append((entry, other))
+    # Sweep in start order with a heap of entries that haven't ended yet:
+    # only those can overlap the next one, so this is O(N log N + overlaps)
+    # instead of comparing every pair (karaoke SRTs have one entry per word)
+    overlap_pairs = []
+    active = []  # (end, position) of entries still open at the sweep point
+    for j in sorted(range(len(entries)), key=starts.__getitem__):
+        start, end = starts[j], ends[j]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, i in active:
+            if starts[i] < end:
+                overlap_pairs.append((min(i, j), max(i, j)))
+        heapq.heappush(active, (end, j))
+    overlaps = [(entries[i], entries[j]) for i, j in sorted(overlap_pairs)]
 
     if overlaps:
         issues.append({
@@ -139,12 +198,9 @@ def validate_format(entries: list[SRTEntry], expected_words: list[str] | None =
         })
 
     # Check 2: Non-sequential timestamps
-    non_sequential = []
-    for i in range(len(entries) - 1):
-        current = entries[i]
-        next_entry = entries[i + 1]
-        if current.end > next_entry.start:
-            non_sequential.append((current, next_entry))
+    non_sequential = [
+        (entries[i], entries[i + 1]) for i, gap in enumerate(gaps) if gap < 0
+    ]
 
     if non_sequential:
         issues.append({
@@ -155,8 +211,8 @@ def validate_format(entries: list[SRTEntry], expected_words: list[str] | None =
         })
 
     # Check 3: Unreasonable durations
-    too_short = [e for e in entries if e.duration < 0.1]  # < 100ms
-    too_long = [e for e in entries if e.duration > 10.0]  # > 10s
+    too_short = [e for e, d in zip(entries, durations) if d < 0.1]  # < 100ms
+    too_long = [e for e, d in zip(entries, durations) if d > 10.0]  # > 10s
 
     if too_short:
         warnings.append({
@@ -174,16 +230,16 @@ def validate_format(entries: list[SRTEntry], expected_words: list[str] | None =
 
     # Check 4: Word accuracy (if expected words provided)
     if expected_words:
-        transcribed_words = []
-        for entry in entries:
-            words = entry.text.lower().split()
-            transcribed_words.extend([w.strip(".,!?;:") for w in words if w.strip(".,!?;:")])
+        transcribed_words = [
+            w
+            for entry in entries
+            for word in entry.text.lower().split()
+            if (w := word.strip(_PUNCTUATION))
+        ]
 
-        missing_words = set(expected_words) - set(transcribed_words)
-        extra_words = []
-        for word in transcribed_words:
-            if word not in expected_words:
-                extra_words.append(word)
+        expected_set = set(expected_words)
+        missing_words = expected_set - set(transcribed_words)
+        extra_words = [w for w in transcribed_words if w not in expected_set]
 
         if missing_words:
             issues.append({
@@ -202,13 +258,11 @@ def validate_format(entries: list[SRTEntry], expected_words: list[str] | None =
             })
 
     # Check 5: Large gaps between entries
-    large_gaps = []
-    for i in range(len(entries) - 1):
-        current = entries[i]
-        next_entry = entries[i + 1]
-        gap = next_entry.start - current.end
-        if gap > 2.0:  # > 2 second gap
-            large_gaps.append((current, next_entry, gap))
+    large_gaps = [
+        (entries[i], entries[i + 1], gap)
+        for i, gap in enumerate(gaps)
+        if gap > 2.0  # > 2 second gap
+    ]
 
     if large_gaps:
         warnings.append({
@@ -3,6 +3,7 @@ Pytest fixtures and configuration for baobao tests.
 """
 
 import asyncio
+import json
 from pathlib import Path
 
 import pytest
@@ -11,6 +12,18 @@ import pytest
 TEST_DATA_DIR = Path(__file__).parent / "data"
 SONGS_DIR = Path(__file__).parent.parent / "songs"
 
+# LLM answers kept between test runs (see the llm_cache fixture)
+LLM_CACHE_DIR = Path(__file__).parent / ".cache" / "ollama"
+
+
+def pytest_addoption(parser):
+    """Add baobao's command line options."""
+    parser.addoption(
+        "--live-llm",
+        action="store_true",
+        help="Ask Ollama even for phrases answered by earlier test runs",
+    )
+
 
 @pytest.fixture(scope="session")
 def test_data_dir():
@@ -35,6 +48,20 @@ def sample_audio_path(songs_dir):
     pytest.skip("No MP3 files found in songs directory")
 
 
+@pytest.fixture(scope="session")
+def shared_transcriber():
+    """Base-model transcriber shared by all tests, so Whisper loads once."""
+    from baobao.transcribe import Transcriber, TranscriptionConfig
+
+    return Transcriber(TranscriptionConfig(model_size="base"))
+
+
+@pytest.fixture(scope="session")
+def sample_segments(shared_transcriber, sample_audio_path):
+    """Segments for the sample audio, transcribed once per session."""
+    return shared_transcriber.transcribe(sample_audio_path)
+
+
 @pytest.fixture(scope="session")
 def sample_srt_path(songs_dir):
     """Path to a sample SRT file for testing."""
@@ -44,7 +71,7 @@ def sample_srt_path(songs_dir):
     pytest.skip("No test SRT files found in songs directory")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_srt_content():
     """Sample SRT content for unit tests."""
     return """1
@@ -73,10 +100,23 @@ def sample_srt_content():
 """
 
 
-@pytest.fixture
-def temp_srt_file(tmp_path, sample_srt_content):
-    """Create a temporary SRT file for testing."""
-    srt_path = tmp_path / "test.srt"
+@pytest.fixture(scope="session")
+def parsed_sample_srt(sample_srt_content):
+    """Entries of sample_srt_content, parsed once (tests must not modify them)."""
+    from baobao.enhance import _parse_srt
+
+    return _parse_srt(sample_srt_content)
+
+
+@pytest.fixture(scope="session")
+def temp_srt_file(tmp_path_factory, sample_srt_content):
+    """
+    Create a temporary SRT file for testing.
+
+    Written once per session: tests only read it (enhanced output goes to
+    sibling files).
+    """
+    srt_path = tmp_path_factory.mktemp("srt") / "test.srt"
     srt_path.write_text(sample_srt_content, encoding="utf-8")
     return srt_path
 
@@ -102,6 +142,45 @@ def word_highlighted_srt_content():
 """
 
 
+@pytest.fixture(scope="module")
+def llm_cache(request, tmp_path_factory):
+    """
+    Point the phrase cache at tests/.cache/ollama for a module's tests.
+
+    Keeps what Ollama answered on earlier runs, so the enhancement tests
+    make no LLM calls for known phrases. With --live-llm the cache starts
+    empty. The accuracy tests don't use it; they always ask the model.
+    """
+    from baobao import _cache
+
+    if request.config.getoption("--live-llm"):
+        cache_dir = tmp_path_factory.mktemp("ollama")
+    else:
+        cache_dir = LLM_CACHE_DIR
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_cache, "PHRASE_DIR", cache_dir)
+        yield cache_dir
+
+
+@pytest.fixture(scope="session")
+def canned_cache():
+    """Full-format interpretations by phrase, from data/enhance_cache.json."""
+    return json.loads((TEST_DATA_DIR / "enhance_cache.json").read_text("utf-8"))
+
+
+@pytest.fixture
+def canned_enhancer(canned_cache):
+    """ChineseEnhancer whose cache already holds the canned interpretations."""
+    from baobao.enhance import ChineseEnhancer
+
+    enhancer = ChineseEnhancer()
+    enhancer._cache = {
+        enhancer._cache_key(text): value for text, value in canned_cache.items()
+    }
+    return enhancer
+
+
 # Test phrases for synthetic audio tests
 TEST_PHRASES = [
     ("你好", "nǐ hǎo", ["hello", "hi"]),
@@ -0,0 +1,154 @@
+"""
+Unit tests for CLI helpers.
+"""
+
+import os
+
+from typer.testing import CliRunner
+
+from baobao import cli
+from baobao.cli import _find_subtitle, app
+
+
+class TestFindSubtitle:
+    """Tests for subtitle auto-detection."""
+
+    def test_prefers_enhanced_srt(self, tmp_path):
+        """Test that enhanced subtitles win over plain SRT."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+        (tmp_path / "song.srt").write_text("")
+        (tmp_path / "song.enhanced.srt").write_text("")
+
+        assert _find_subtitle(audio) == tmp_path / "song.enhanced.srt"
+
+    def test_lyrics_formats(self, tmp_path):
+        """Test that LRC is only considered when lyrics formats are enabled."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+        (tmp_path / "song.lrc").write_text("")
+
+        assert _find_subtitle(audio) == tmp_path / "song.lrc"
+        assert _find_subtitle(audio, lyrics_formats=False) is None
+
+    def test_test_srt_pattern(self, tmp_path):
+        """Test fallback to the .test.srt naming pattern."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+        (tmp_path / "song.test.srt").write_text("")
+
+        assert _find_subtitle(audio) == tmp_path / "song.test.srt"
+
+    def test_dotted_audio_name(self, tmp_path):
+        """Test that only the audio extension is replaced."""
+        audio = tmp_path / "song.v2.mp3"
+        audio.write_bytes(b"")
+        (tmp_path / "song.srt").write_text("")
+        (tmp_path / "song.v2.test.srt").write_text("")
+
+        assert _find_subtitle(audio) == tmp_path / "song.v2.test.srt"
+
+    def test_no_subtitle(self, tmp_path):
+        """Test that None is returned when nothing matches."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+
+        assert _find_subtitle(audio) is None
+
+
+class TestPlayPreview:
+    """Tests for the shared play/preview launcher."""
+
+    def test_missing_mpv(self, tmp_path, monkeypatch):
+        """Test that both commands fail cleanly without mpv."""
+        monkeypatch.setattr(cli, "_mpv_path", lambda: None)
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+
+        for command in ("play", "preview"):
+            result = CliRunner().invoke(app, [command, str(audio)])
+            assert result.exit_code == 1
+            assert "mpv not found" in result.stdout
+
+    def test_no_subtitle_found(self, tmp_path, monkeypatch):
+        """Test the error when no subtitle sits next to the audio."""
+        monkeypatch.setattr(cli, "_mpv_path", lambda: "/usr/bin/mpv")
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+
+        result = CliRunner().invoke(app, ["play", str(audio)])
+
+        assert result.exit_code == 1
+        assert "No subtitle file found" in result.stdout
+
+
+class TestTranscribeOptions:
+    """Tests for transcribe argument validation."""
+
+    def test_rejects_unknown_format(self, tmp_path):
+        """Test that a bad --format fails before any model work."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+
+        result = CliRunner().invoke(app, ["transcribe", str(audio), "-f", "sr"])
+
+        assert result.exit_code == 2
+
+
+class TestBatch:
+    """Tests for batch file selection."""
+
+    def test_skips_up_to_date_srt(self, tmp_path):
+        """Test that audio with a newer SRT is not re-transcribed."""
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"fake audio")
+        srt = tmp_path / "song.srt"
+        srt.write_text("")
+        os.utime(audio, (1_000, 1_000))
+        os.utime(srt, (2_000, 2_000))
+
+        result = CliRunner().invoke(app, ["batch", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "Skip (up to date): song.mp3" in result.stdout
+        assert "0 success, 0 failed, 1 up to date" in result.stdout
+
+    def test_stale_srt_is_not_skipped(self, tmp_path, monkeypatch):
+        """Test that audio newer than its SRT is queued for transcription."""
+        from baobao import transcribe
+
+        transcribed = []
+
+        def fake_transcribe_audio(audio_path, **kwargs):
+            transcribed.append(audio_path.name)
+            return audio_path.with_suffix(".srt")
+
+        monkeypatch.setattr(transcribe, "transcribe_audio", fake_transcribe_audio)
+        for name, audio_mtime in (("fresh.mp3", 1_000), ("stale.mp3", 3_000)):
+            audio = tmp_path / name
+            audio.write_bytes(b"fake audio")
+            srt = audio.with_suffix(".srt")
+            srt.write_text("")
+            os.utime(audio, (audio_mtime, audio_mtime))
+            os.utime(srt, (2_000, 2_000))
+        (tmp_path / "new.mp3").write_bytes(b"fake audio")
+
+        result = CliRunner().invoke(app, ["batch", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert sorted(transcribed) == ["new.mp3", "stale.mp3"]
+        assert "2 success, 0 failed, 1 up to date" in result.stdout
+        assert "Baobao Batch Transcription: Files: 3, Model: large-v3" in result.stdout
+
+
+class TestEntryPoint:
+    """Tests for the console entry point."""
+
+    def test_version_fast_path(self, monkeypatch, capsys):
+        """Test that --version answers without going through Typer."""
+        from baobao import __main__
+
+        monkeypatch.setattr("sys.argv", ["baobao", "--version"])
+        __main__.main()
+
+        assert capsys.readouterr().out == "baobao version 0.1.0\n"
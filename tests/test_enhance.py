@@ -75,9 +75,9 @@ class TestPydanticModels:
 class TestParseSrt:
     """Tests for SRT parsing."""
 
-    def test_parse_simple_srt(self, sample_srt_content):
+    def test_parse_simple_srt(self, parsed_sample_srt):
         """Test parsing simple SRT content."""
-        entries = _parse_srt(sample_srt_content)
+        entries = parsed_sample_srt
 
         assert len(entries) == 6
         assert entries[0]["index"] == 1
@@ -96,6 +96,19 @@ class TestParseSrt:
         assert len(entries) == 4
         assert '<font color="#00ff00">' in entries[0]["text"]
 
+    def test_parse_multiline_crlf(self):
+        """Test that multi-line text is joined and CRLF endings are handled."""
+        content = "1\r\n00:00:01,000 --> 00:00:02,000\r\n你是\r\n我陽光\r\n\r\n"
+        entries = _parse_srt(content)
+
+        assert entries == [
+            {
+                "index": 1,
+                "timestamp": "00:00:01,000 --> 00:00:02,000",
+                "text": "你是我陽光",
+            }
+        ]
+
 
 class TestChineseEnhancer:
     """Tests for ChineseEnhancer class."""
@@ -129,20 +142,9 @@ class TestChineseEnhancer:
         clean = re.sub(r"<[^>]+>", "", chinese_with_html).strip()
         assert clean == "你好"
 
-    def test_format_subtitle_line_structure(self):
+    def test_format_subtitle_line_structure(self, canned_enhancer):
         """Test format_subtitle_line returns correct structure."""
-        enhancer = ChineseEnhancer()
-        # Mock the cache to avoid LLM call
-        enhancer._cache["full:你好"] = {
-            "pinyin": "nǐ hǎo",
-            "english": "hello",
-            "word_details": [
-                {"char": "你", "pinyin": "nǐ", "english": "you"},
-                {"char": "好", "pinyin": "hǎo", "english": "good"},
-            ],
-        }
-
-        result = enhancer.format_subtitle_line("你好")
+        result = canned_enhancer.format_subtitle_line("你好")
 
         assert "chinese" in result
         assert "pinyin" in result
@@ -150,40 +152,203 @@ class TestChineseEnhancer:
         assert "english" in result
         assert "word_details" in result
 
-    def test_format_subtitle_with_highlight(self):
+    def test_format_subtitle_with_highlight(self, canned_enhancer):
         """Test formatting with highlighted character."""
-        enhancer = ChineseEnhancer()
-        # Mock the cache
-        enhancer._cache["full:你好"] = {
-            "pinyin": "nǐ hǎo",
-            "english": "hello",
-            "word_details": [
-                {"char": "你", "pinyin": "nǐ", "english": "you"},
-                {"char": "好", "pinyin": "hǎo", "english": "good"},
-            ],
-        }
-
-        result = enhancer.format_subtitle_line('<font color="#00ff00">你</font>好')
+        result = canned_enhancer.format_subtitle_line(
+            '<font color="#00ff00">你</font>好'
+        )
 
         # The highlighted character should have highlighted pinyin
         assert '<font color="#00ff00">nǐ</font>' in result["pinyin"]
 
-    def test_caching(self):
-        """Test that results are cached."""
-        enhancer = ChineseEnhancer()
+    def test_format_subtitle_highlights_sung_occurrence(self, canned_enhancer):
+        """Test that a repeated character's pinyin is highlighted where sung."""
+        result = canned_enhancer.format_subtitle_line(
+            '你愛<font color="#00ff00">你</font>'
+        )
+
+        assert result["pinyin"] == 'nǐ ài <font color="#00ff00">nǐ</font>'
 
-        # Manually add to cache
-        enhancer._cache["full:測試"] = {
-            "pinyin": "cè shì",
-            "english": "test",
+    def test_format_subtitle_line_keeps_learning_fields(self):
+        """Test that learn-format fields come back with the formatted line."""
+        enhancer = ChineseEnhancer(EnhanceConfig(output_format=OutputFormat.LEARN))
+        enhancer._cache[enhancer._cache_key("你好")] = {
+            "pinyin": "nǐ hǎo",
+            "english": "hello",
+            "literal_gloss": "you good",
+            "sing_along_tip": "👋 wave hello",
             "word_details": [],
         }
 
+        result = enhancer.format_subtitle_line("你好")
+
+        assert result["sing_along_tip"] == "👋 wave hello"
+        assert result["literal_gloss"] == "you good"
+
+    def test_caching(self, canned_enhancer):
+        """Test that results are cached."""
         # Should return cached result
-        result = enhancer.interpret_phrase("測試")
+        result = canned_enhancer.interpret_phrase("測試")
         assert result["pinyin"] == "cè shì"
         assert result["english"] == "test"
 
+    def test_interpret_uses_final_streamed_partial(self):
+        """Test that the last streamed partial becomes the interpretation."""
+
+        class FakeClient:
+            def create_partial(self, response_model, **kwargs):
+                yield response_model.model_construct(pinyin="nǐ")
+                yield response_model(pinyin="nǐ hǎo", english="hello", word_details=[])
+
+        enhancer = ChineseEnhancer()
+        enhancer._client = FakeClient()
+
+        result = enhancer.interpret_phrase("你好")
+
+        assert result["pinyin"] == "nǐ hǎo"
+        assert result["english"] == "hello"
+
+    def test_llm_failure_falls_back(self):
+        """Test that a failed request gives a placeholder that isn't persisted."""
+
+        class FakeClient:
+            def create_partial(self, **kwargs):
+                raise ConnectionError("offline")
+
+        enhancer = ChineseEnhancer(EnhanceConfig(output_format=OutputFormat.LEARN))
+        enhancer._client = FakeClient()
+
+        result = enhancer.interpret_phrase("你好")
+
+        assert result["english"] == "?"
+        assert result["sing_along_tip"] == ""
+        assert [d["char"] for d in result["word_details"]] == ["你", "好"]
+        assert enhancer._failed == {enhancer._cache_key("你好")}
+
+    def test_prompts_share_instruction_prefix(self):
+        """Test that only the end of the prompt varies between phrases."""
+        prompts = []
+
+        class FakeClient:
+            def create_partial(self, messages, response_model, **kwargs):
+                prompts.append(messages[0]["content"])
+                yield response_model(pinyin="", english="", word_details=[])
+
+        enhancer = ChineseEnhancer()
+        enhancer._client = FakeClient()
+        enhancer.interpret_phrase("你好")
+        enhancer.interpret_phrase("再見")
+
+        first, second = prompts
+        shared = first.index("Chinese: 你好")
+        assert first[:shared] == second[:shared]
+        assert second[shared:].startswith("Chinese: 再見")
+
+    def test_interpret_for_learning_keys(self):
+        """Test that learn-format results expose the shared pinyin/english keys."""
+        details = [WordDetail(char="你", pinyin="nǐ", english="you")]
+
+        class FakeClient:
+            def create_partial(self, response_model, **kwargs):
+                yield response_model(
+                    pinyin_spaced="nǐ hǎo",
+                    literal_gloss="you good",
+                    natural_english="hello",
+                    sing_along_tip="👋",
+                    word_details=details,
+                )
+
+        enhancer = ChineseEnhancer(EnhanceConfig(output_format=OutputFormat.LEARN))
+        enhancer._client = FakeClient()
+
+        result = enhancer.interpret_phrase("你好")
+
+        assert result["pinyin"] == result["pinyin_spaced"] == "nǐ hǎo"
+        assert result["english"] == "hello"
+        assert "natural_english" not in result
+        assert result["word_details"] == [
+            {"char": "你", "pinyin": "nǐ", "english": "you"}
+        ]
+
+    def test_interpret_phrases_batch(self):
+        """Test that several phrases are answered by one LLM request."""
+        requests = []
+
+        class FakeClient:
+            def create_partial(self, response_model, **kwargs):
+                requests.append(kwargs["timeout"])
+                yield response_model(
+                    results=[
+                        PhraseInterpretation(
+                            pinyin="nǐ hǎo", english="hello", word_details=[]
+                        ),
+                        PhraseInterpretation(
+                            pinyin="zài jiàn", english="goodbye", word_details=[]
+                        ),
+                    ]
+                )
+
+        enhancer = ChineseEnhancer()
+        enhancer._client = FakeClient()
+
+        results = enhancer.interpret_phrases_batch(["你好", "再見", "你好"])
+
+        assert [r["english"] for r in results] == ["hello", "goodbye", "hello"]
+        assert requests == [60.0]  # One request, timeout scaled for 2 phrases
+
+    def test_cache_persists_across_runs(self, tmp_path, monkeypatch):
+        """Test that saved interpretations reload, minus LLM failures."""
+        from baobao import _cache
+
+        monkeypatch.setattr(_cache, "PHRASE_DIR", tmp_path)
+        enhancer = ChineseEnhancer()
+        failed_key = enhancer._cache_key("再見")
+        enhancer._cache[enhancer._cache_key("你好")] = {"english": "hello"}
+        enhancer._cache[failed_key] = {"english": "?"}
+        enhancer._failed.add(failed_key)
+        enhancer.save_cache()
+
+        reloaded = ChineseEnhancer()
+        reloaded.load_cache()
+
+        other_model = ChineseEnhancer(EnhanceConfig(model="llama3:8b"))
+        other_model.load_cache()
+
+        assert list(reloaded._cache) == [reloaded._cache_key("你好")]
+        assert reloaded._cache[reloaded._cache_key("你好")]["english"] == "hello"
+        assert other_model._cache == {}
+
+    def test_concurrent_saves_merge(self, tmp_path, monkeypatch):
+        """Test that a save keeps entries another run saved meanwhile."""
+        from baobao import _cache
+
+        monkeypatch.setattr(_cache, "PHRASE_DIR", tmp_path)
+        first, second = ChineseEnhancer(), ChineseEnhancer()
+        first._cache[first._cache_key("你好")] = {"english": "hello"}
+        second._cache[second._cache_key("再見")] = {"english": "goodbye"}
+        first.save_cache()
+        second.save_cache()
+
+        reloaded = ChineseEnhancer()
+        reloaded.load_cache()
+
+        assert reloaded._cache == {
+            reloaded._cache_key("你好"): {"english": "hello"},
+            reloaded._cache_key("再見"): {"english": "goodbye"},
+        }
+
+    def test_corrupt_cache_is_ignored(self, tmp_path, monkeypatch):
+        """Test that an unreadable cache file starts an empty cache."""
+        from baobao import _cache
+
+        monkeypatch.setattr(_cache, "PHRASE_DIR", tmp_path)
+        (tmp_path / "qwen3_4b.json").write_text("{not json", encoding="utf-8")
+
+        enhancer = ChineseEnhancer()
+        enhancer.load_cache()
+
+        assert enhancer._cache == {}
+
 
 class TestEnhanceSrtFunction:
     """Tests for enhance_srt function."""
@@ -199,3 +364,54 @@ class TestEnhanceSrtFunction:
         assert no_ext.with_suffix(".enhanced.srt").name == "file.enhanced.srt"
         assert no_ext.with_suffix(".emoji.srt").name == "file.emoji.srt"
         assert no_ext.with_suffix(".learn.srt").name == "file.learn.srt"
+
+    def test_enhance_srt_writes_all_entries(
+        self, word_highlighted_srt_content, tmp_path, monkeypatch
+    ):
+        """Test enhancing a file end to end with a stubbed LLM."""
+        from baobao.enhance import enhance_srt
+
+        calls = []
+
+        def fake_interpret(self, chinese_text):
+            clean = re.sub(r"<[^>]+>", "", chinese_text).strip()
+            calls.append(clean)
+            return {"pinyin": "nǐ", "english": "you", "word_details": []}
+
+        monkeypatch.setattr(ChineseEnhancer, "client", None)
+        monkeypatch.setattr(ChineseEnhancer, "check_connection", lambda self: True)
+        monkeypatch.setattr(ChineseEnhancer, "interpret_phrase", fake_interpret)
+        srt_path = tmp_path / "song.srt"
+        srt_path.write_text(word_highlighted_srt_content, encoding="utf-8")
+
+        output = enhance_srt(srt_path)
+
+        assert output == tmp_path / "song.enhanced.srt"
+        assert set(calls) == {"你是我陽光"}
+        assert output.read_text(encoding="utf-8").count("(you)") == 4
+
+    def test_enhance_srt_fully_cached(
+        self, temp_srt_file, parsed_sample_srt, tmp_path, monkeypatch
+    ):
+        """Test that a song with every phrase cached makes no LLM requests."""
+        from baobao import _cache
+        from baobao.enhance import enhance_srt
+
+        def no_client(self):
+            raise AssertionError("LLM client should not be created")
+
+        monkeypatch.setattr(_cache, "PHRASE_DIR", tmp_path / "phrases")
+        monkeypatch.setattr(ChineseEnhancer, "client", property(no_client))
+        monkeypatch.setattr(ChineseEnhancer, "check_connection", lambda self: True)
+        enhancer = ChineseEnhancer()
+        for entry in parsed_sample_srt:
+            enhancer._cache[enhancer._cache_key(entry["text"])] = {
+                "pinyin": "",
+                "english": "cached",
+                "word_details": [],
+            }
+        enhancer.save_cache()
+
+        output = enhance_srt(temp_srt_file, use_cache=True)
+
+        assert output.read_text(encoding="utf-8").count("(cached)") == 6
@@ -21,6 +21,8 @@ class TestTranscriptionConfig:
         assert config.beam_size == 5
         assert config.refine_timestamps is True
         assert config.word_level is True
+        assert config.batch_size is None
+        assert config.compute_type == "auto"
 
     def test_custom_config(self):
         """Test custom configuration."""
@@ -97,6 +99,9 @@ class TestTranscriber:
         assert transcriber._format_srt_time(3661.0) == "01:01:01,000"
         assert transcriber._format_srt_time(3661.5) == "01:01:01,500"
 
+        # Rounds to the nearest millisecond instead of truncating
+        assert transcriber._format_srt_time(4.35) == "00:00:04,350"
+
     def test_write_srt_simple(self, tmp_path):
         """Test writing simple SRT output."""
         transcriber = Transcriber()
@@ -134,6 +139,52 @@ class TestTranscriber:
         assert '<font color="#00ff00">你</font>' in content
         assert '<font color="#00ff00">好</font>' in content
 
+    def test_word_highlight_repeated_word(self, tmp_path):
+        """Test that a repeated word is highlighted where it is sung."""
+        transcriber = Transcriber()
+        segments = [
+            LyricSegment(
+                start=0.0,
+                end=3.0,
+                text="你好你",
+                words=[
+                    {"start": 0.0, "end": 1.0, "word": "你"},
+                    {"start": 1.0, "end": 2.0, "word": "好"},
+                    {"start": 2.0, "end": 3.0, "word": "你"},
+                ],
+            ),
+        ]
+
+        output_path = tmp_path / "test.srt"
+        transcriber.save_srt(segments, output_path, word_highlight=True)
+
+        content = output_path.read_text(encoding="utf-8")
+        assert '<font color="#00ff00">你</font>好你' in content
+        assert '你好<font color="#00ff00">你</font>' in content
+
+    def test_word_highlight_after_unmatched_word(self, tmp_path):
+        """Test that a short word after an unmatched one isn't found mid-word."""
+        transcriber = Transcriber()
+        segments = [
+            LyricSegment(
+                start=0.0,
+                end=3.0,
+                text="Mary had a lamb",
+                words=[
+                    {"start": 0.0, "end": 1.0, "word": "Mary"},
+                    {"start": 1.0, "end": 2.0, "word": "has"},  # Not in text
+                    {"start": 2.0, "end": 3.0, "word": "a"},
+                ],
+            ),
+        ]
+
+        output_path = tmp_path / "test.srt"
+        transcriber.save_srt(segments, output_path, word_highlight=True)
+
+        content = output_path.read_text(encoding="utf-8")
+        assert '\nMary had <font color="#00ff00">a</font> lamb\n' in content
+        assert "h<font" not in content
+
     def test_save_lrc(self, tmp_path):
         """Test saving LRC format."""
         transcriber = Transcriber()
@@ -177,3 +228,61 @@ class TestTranscribeAudioFunction:
         # Check the expected output path would be correct
         expected_srt = audio_path.with_suffix(".srt")
         assert expected_srt.name == "test.srt"
+
+    def test_audio_duration_unreadable(self, tmp_path):
+        """Test that a file without a readable header has no duration."""
+        from baobao.transcribe import audio_duration
+
+        audio_path = tmp_path / "test.mp3"
+        audio_path.write_bytes(b"fake audio")
+
+        assert audio_duration(audio_path) is None
+
+
+class TestTranscriptCache:
+    """Tests for the content-addressed transcript cache."""
+
+    def test_key_depends_on_content_and_settings(self, tmp_path):
+        """Test that audio bytes and settings both change the key."""
+        from baobao import _cache
+
+        audio_a = tmp_path / "a.mp3"
+        audio_b = tmp_path / "b.mp3"
+        audio_a.write_bytes(b"same audio")
+        audio_b.write_bytes(b"same audio")
+
+        key = _cache.transcript_key(audio_a, "base", "srt", False)
+        assert key == _cache.transcript_key(audio_b, "base", "srt", False)
+        assert key != _cache.transcript_key(audio_a, "base", "srt", True)
+        assert key != _cache.transcript_key(audio_a, "large-v3", "srt", False)
+        assert key != _cache.transcript_key(audio_a, "base", "srt", False, refine=False)
+
+        audio_b.write_bytes(b"other audio")
+        assert key != _cache.transcript_key(audio_b, "base", "srt", False)
+
+    def test_empty_file_digest(self, tmp_path):
+        """Test hashing an empty file (cannot be mmapped)."""
+        from baobao import _cache
+
+        audio = tmp_path / "empty.mp3"
+        audio.write_bytes(b"")
+        assert len(_cache.audio_digest(audio)) == 32
+
+    def test_cache_hit_skips_transcription(self, tmp_path, monkeypatch):
+        """Test that a cached transcript is restored without loading Whisper."""
+        from baobao import _cache
+        from baobao.transcribe import transcribe_audio
+
+        monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path / "cache")
+        audio_path = tmp_path / "test.mp3"
+        audio_path.write_bytes(b"fake audio")
+
+        cached_srt = tmp_path / "cached.srt"
+        cached_srt.write_text("1\n00:00:00,000 --> 00:00:01,000\n你好\n\n")
+        key = _cache.transcript_key(audio_path, "base", "srt", False)
+        _cache.store(key, cached_srt)
+
+        result = transcribe_audio(audio_path, model_size="base", use_cache=True)
+
+        assert result == audio_path.with_suffix(".srt")
+        assert "你好" in result.read_text(encoding="utf-8")